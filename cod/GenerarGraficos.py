@@ -5,15 +5,142 @@ Created on Sat Jun  8 15:27:20 2024
 @author: Eyeri Méndez
 """
 
+import base64
+import json
+import multiprocessing
+import struct
+import sys
+import threading
+import uuid
+import zlib
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+
 import numpy as np
+import pandas as pd
+from pandas.tseries.api import guess_datetime_format
 import plotly.express as px
-import plotly.figure_factory as ff
-from dash import dcc, html, Output, Input
+import plotly.graph_objects as go
+import plotly.io as pio
+from plotly.utils import PlotlyJSONEncoder
+from dash import dcc, html, ctx, no_update, Output, Input, State, Patch, MATCH, ALL
+from dash.exceptions import PreventUpdate
+
+# Registros de gráficos de cada instancia de GenerarGraficos en los procesos 
+# del grupo de procesos, indexados por el id de la instancia en el servidor, 
+# con las funciones y los datos de cada gráfico
+_registros = {}
+
+# Iniciar un proceso del grupo
+def _iniciar_proceso(instancia, registro):
+    
+    """
+    Guarda el registro de gráficos de una instancia al iniciar un proceso del 
+    grupo de procesos.
+
+    Parameters:
+    -----------
+    instancia: int
+               Id de la instancia de GenerarGraficos.
+               
+    registro: dict o bytes
+              Registro de gráficos de la instancia; con 'spawn' llega 
+              serializado con 'dill'.
+
+    Returns:
+    --------
+    None
+    """
+    
+    if isinstance(registro, bytes):
+        
+        import dill
+        
+        registro = dill.loads(registro)
+    
+    _registros[instancia] = registro
+
+# Construir una figura en un proceso del grupo
+def _construir_figura_proceso(instancia, tipo, indice, valores):
+    
+    """
+    Construye la figura de un gráfico dentro de un proceso del grupo de 
+    procesos, con el registro que recibió el proceso al iniciarse.
+
+    Parameters:
+    -----------
+    instancia: int
+               Id de la instancia de GenerarGraficos.
+               
+    tipo: str
+          Tipo del gráfico.
+          
+    indice: int
+            Índice del gráfico dentro de su tipo.
+            
+    valores: list
+             Valores de los controles del gráfico.
+
+    Returns:
+    --------
+        str: Figura en formato JSON.
+    """
+    
+    funcion = _registros[instancia][(tipo, indice)]
+    
+    return pio.to_json(funcion(*valores), validate = False)
 
 class GenerarGraficos:
     
+    # Callback cosmético que se ejecuta en el navegador. Recibe los valores de los
+    # controles cosméticos, la figura actual y las plantillas de los temas, y 
+    # devuelve una copia de la figura con las propiedades modificadas
+    __PARCHE_CLIENTE = """
+    function () {
+        
+        var valores = Array.prototype.slice.call(arguments);
+        var plantillas = valores.pop();
+        var figura = valores.pop();
+        var configuracion = __CONFIGURACION__;
+        
+        if (!figura) {
+            return window.dash_clientside.no_update;
+        }
+        
+        function asignar(objeto, ruta, valor) {
+            var copia = Array.isArray(objeto) ? objeto.slice() : Object.assign({}, objeto);
+            var llave = ruta[0];
+            copia[llave] = ruta.length === 1 ? valor : asignar(copia[llave] || {}, ruta.slice(1), valor);
+            return copia;
+        }
+        
+        function traducir(valor, tabla) {
+            if (Array.isArray(valor)) {
+                valor = valor.length > 0;
+            }
+            return tabla === null ? valor : tabla[valor];
+        }
+        
+        figura = asignar(figura, ['layout', 'template'], plantillas[valores[0]]);
+        figura = asignar(figura, ['layout', 'title', 'text'], 
+                         valores[1] ? valores[1] : configuracion.titulo);
+        
+        configuracion.propiedades.forEach(function (propiedad, i) {
+            figura = asignar(figura, propiedad[0], traducir(valores[i + 2], propiedad[1]));
+        });
+        
+        return figura;
+    }
+    """
+    
+    # Niveles de detalle de los ejes de fechas: frecuencia de pandas y su 
+    # duración aproximada en días
+    __NIVELES_FECHAS = [('D', 1), ('W', 7), ('MS', 30.44), ('YS', 365.25)]
+    
     # Constructor
-    def __init__(self, app):
+    def __init__(self, app, max_figuras = 128, max_bytes_figuras = 64 * 1024 ** 2, 
+                 modo_cliente = False, umbral_webgl = 1000, pestannas = False, 
+                 cache_segundo_plano = None, procesos = 0):
         
         """
         Constructor de la clase GenerarGraficos. Inicializa una nueva instancia
@@ -24,6 +151,49 @@ class GenerarGraficos:
         app: dash.Dash
              Instancia de la aplicación Dash que se va a personalizar
              
+        max_figuras: int, opcional
+                     Número máximo de figuras que se guardan en la caché. Si es 
+                     0 no se guarda ninguna figura. Por defecto es 128.
+                     
+        max_bytes_figuras: int, opcional
+                           Tamaño máximo en bytes (JSON) que ocupan en total las 
+                           figuras guardadas en la caché. Por defecto es 64 MiB.
+                           
+        modo_cliente: bool, opcional
+                      Si es True, los controles cosméticos (tema, título, 
+                      colores, ...) se resuelven con callbacks de JavaScript en 
+                      el navegador, sin consultar al servidor, y los títulos se 
+                      actualizan al presionar Enter o salir del campo de texto. 
+                      Por defecto es False.
+                      
+        umbral_webgl: int, opcional
+                      Número de filas a partir del cual los gráficos de 
+                      dispersión se dibujan con WebGL en lugar de SVG. Por 
+                      defecto es 1000, el mismo umbral que usa plotly express.
+                      
+        pestannas: bool, opcional
+                   Si es True, cada gráfico se muestra en su propia pestaña en 
+                   lugar de agregarse uno debajo de otro. Los controles de 
+                   todas las pestañas se envían al cargar la página y conservan 
+                   sus valores al cambiar de pestaña; la figura inicial de cada 
+                   gráfico se construye la primera vez que se abre su pestaña. 
+                   Por defecto es False.
+                   
+        cache_segundo_plano: str, opcional
+                             Directorio de la caché en disco (diskcache) de los 
+                             gráficos que se construyen en segundo plano. Si 
+                             'max_figuras' es mayor que 0, también guarda las 
+                             figuras ya construidas, que se devuelven sin volver 
+                             a calcularlas. Si no se proporciona, se usa un 
+                             directorio temporal. Por defecto es None.
+                             
+        procesos: int, opcional
+                  Número de procesos que construyen las figuras de los 
+                  callbacks en paralelo. Los procesos se crean al llamar a 
+                  'iniciar_procesos', después de registrar los gráficos; 
+                  mientras tanto, o si es 0, las figuras se construyen en el 
+                  hilo del servidor. Por defecto es 0.
+             
         Returns:
         --------
         None
@@ -69,6 +239,63 @@ class GenerarGraficos:
                           {'label': 'Máximo', 'value': 'max'}, 
                           {'label': 'Mínimo', 'value': 'min'}]
         
+        # Estadísticas para imputar valores nulos, por conjunto de datos
+        self.__estadisticas = {}
+        
+        # Caché LRU de figuras, indexada por gráfico y valores de los controles
+        self.__figuras = OrderedDict()
+        self.__max_figuras = max_figuras
+        self.__max_bytes_figuras = max_bytes_figuras
+        self.__bytes_figuras = 0
+        self.__aciertos = 0
+        self.__fallos = 0
+        self.__candado = threading.Lock()
+        
+        # Plantillas de los temas en formato JSON
+        self.__plantillas = {}
+        
+        # Callbacks cosméticos en el navegador
+        self.__modo_cliente = modo_cliente
+        self.__plantillas_cliente = False
+        
+        # Filas a partir de las cuales se usa WebGL en los gráficos de dispersión
+        self.__umbral_webgl = umbral_webgl
+        
+        # Registro de gráficos: número de gráficos de cada tipo y función que 
+        # construye la figura de cada gráfico, indexada por tipo e índice
+        self.__indices = {}
+        self.__graficos = {}
+        
+        # Componentes y controles de los gráficos agregados cuya figura inicial 
+        # aún no se ha construido; con pestañas se conservan para construirla 
+        # en cada navegador
+        self.__componentes = {}
+        self.__iniciales = {}
+        
+        # Pestañas: gráfico de cada pestaña y contenedores de los gráficos 
+        # cuya pestaña aún no se ha agregado
+        self.__pestannas = pestannas
+        self.__paginas = []
+        self.__contenedores = {}
+        
+        # Callbacks en segundo plano: tipos de gráfico que los usan y 
+        # administrador de las tareas, que se crea con el primero de ellos
+        self.__segundo_plano = set()
+        self.__cache_segundo_plano = cache_segundo_plano
+        self.__administrador = None
+        
+        # Grupo de procesos que construye las figuras de los callbacks y 
+        # gráficos registrados antes de crearlo
+        self.__procesos = procesos
+        self.__grupo = None
+        self.__en_grupo = frozenset()
+        
+        if self.__pestannas:
+            
+            self.__app.layout.children.append(
+                dcc.Tabs(id = 'pestannas_graficos', children = [])
+            )
+        
     # Get app
     @property
     def app(self):
@@ -103,40 +330,2186 @@ class GenerarGraficos:
                     
         Returns:
         --------
-        None
+        None
+        """
+        
+        self.__app = nueva_app
+        
+        if self.__app.layout is None:
+        
+            self.__app.layout = html.Div([
+                
+                html.H1('Aplicación Dash'),
+                
+                html.A('Ver HTML', href='/html', target = '_blank'),
+                
+                html.Div(id = 'contenido_graficos')
+                
+                ])
+
+    # Get estadisticas de la caché
+    @property
+    def cache_figuras(self):
+        
+        """
+        Obtiene el estado de la caché de figuras, útil para ajustar sus límites.
+        
+        Parameters:
+        -----------
+        None
+
+        Returns:
+        --------
+            dict: Aciertos, fallos, número de figuras guardadas y bytes que 
+            ocupan en la caché.
+        """
+        
+        with self.__candado:
+            
+            return {'aciertos': self.__aciertos, 
+                    'fallos': self.__fallos, 
+                    'figuras': len(self.__figuras), 
+                    'bytes': self.__bytes_figuras}
+
+    # Iniciar el grupo de procesos
+    def iniciar_procesos(self):
+        
+        """
+        Crea el grupo de procesos que construye las figuras de los callbacks, 
+        si la instancia se creó con 'procesos' mayor que 0. Se debe llamar una 
+        vez, después de registrar los gráficos y antes de ejecutar el servidor 
+        (app.run_server); los gráficos registrados después se construyen en el 
+        hilo del servidor.
+        
+        En Linux los procesos se crean con 'fork' y heredan los datos de los 
+        gráficos. En Windows y macOS, donde 'fork' no existe o no es seguro, se 
+        crean con 'spawn' y reciben una copia del registro de gráficos 
+        serializada con el paquete 'dill' (incluido en dash[diskcache]); en ese 
+        caso el script que crea la aplicación debe protegerse con 
+        if __name__ == '__main__'.
+
+        Parameters:
+        -----------
+        None
+
+        Returns:
+        --------
+        None
+        """
+        
+        if not self.__procesos or self.__grupo is not None:
+            
+            return
+        
+        if sys.platform.startswith('linux'):
+            
+            contexto = multiprocessing.get_context('fork')
+            
+            registro = self.__graficos
+            
+        else:
+            
+            try:
+                
+                import dill
+                
+            except ImportError as error:
+                
+                raise ImportError("Los procesos fuera de Linux requieren el paquete "
+                                  "'dill': pip install dill") from error
+            
+            contexto = multiprocessing.get_context('spawn')
+            
+            registro = dill.dumps(self.__graficos)
+        
+        self.__en_grupo = frozenset(self.__graficos)
+        
+        self.__grupo = ProcessPoolExecutor(self.__procesos, mp_context = contexto, 
+                                           initializer = _iniciar_proceso, 
+                                           initargs = (id(self), registro))
+        
+        # Se crean todos los procesos ahora, fuera de los hilos del servidor
+        for tarea in [self.__grupo.submit(int) for _ in range(self.__procesos)]:
+            
+            tarea.result()
+
+    # str
+    def __str__(self):
+        
+        '''
+        Devuelve una representación legible en forma de cadena de la
+        instancia de la clase
+               
+        Returns
+        -------
+            str: Texto que describe los atributos de la instancia.
+        '''
+        
+        return 'App actual: Aplicación Dash'
+    
+    # Obtener el estado que se copia a otros procesos
+    def __getstate__(self):
+        
+        """
+        Devuelve el estado de la instancia que se copia a los procesos creados 
+        con 'spawn'. Se omiten la aplicación, los candados, el grupo de procesos 
+        y la caché de figuras, que solo usa el servidor.
+
+        Parameters:
+        -----------
+        None
+
+        Returns:
+        --------
+            dict: Atributos de la instancia.
+        """
+        
+        estado = self.__dict__.copy()
+        
+        for atributo in ('app', 'candado', 'grupo', 'administrador', 'figuras'):
+            
+            del estado['_GenerarGraficos__' + atributo]
+            
+        return estado
+    
+    # Restablecer el estado en otro proceso
+    def __setstate__(self, estado):
+        
+        """
+        Restablece una instancia copiada con '__getstate__', sin aplicación y con 
+        candados y caché de figuras nuevos.
+
+        Parameters:
+        -----------
+        estado: dict
+                Atributos de la instancia.
+
+        Returns:
+        --------
+        None
+        """
+        
+        self.__dict__.update(estado)
+        
+        self.__app = None
+        self.__candado = threading.Lock()
+        self.__grupo = None
+        self.__administrador = None
+        self.__figuras = OrderedDict()
+        self.__bytes_figuras = 0
+
+    # Convertir los valores de los controles en una llave de la caché
+    def __llave(self, valor):
+        
+        """
+        Convierte recursivamente listas y diccionarios (por ejemplo el valor de 
+        un dcc.Checklist) en tuplas para poder usarlos como llave de la caché.
+
+        Parameters:
+        -----------
+        valor: object
+               Valor de un control de la aplicación.
+
+        Returns:
+        --------
+            object: Versión inmutable del valor.
+        """
+        
+        if isinstance(valor, (list, tuple)):
+            
+            return tuple(self.__llave(v) for v in valor)
+        
+        if isinstance(valor, dict):
+            
+            return tuple(sorted((k, self.__llave(v)) for k, v in valor.items()))
+        
+        return valor
+
+    # Crear el identificador de un nuevo gráfico
+    def __nuevo_grafico(self, tipo, segundo_plano = False):
+        
+        """
+        Reserva el índice del siguiente gráfico del tipo dado. Los componentes 
+        de cada gráfico usan ids de tipo diccionario con el tipo y el índice del 
+        gráfico, de modo que un mismo tipo puede aparecer muchas veces en la 
+        aplicación y todos sus gráficos comparten un solo callback.
+
+        Parameters:
+        -----------
+        tipo: str
+              Tipo del gráfico. Los gráficos cuyos callbacks reciben controles 
+              distintos deben usar tipos distintos.
+              
+        segundo_plano: bool, opcional
+                       Si es True, el gráfico usa un tipo propio cuyo callback se 
+                       ejecuta en segundo plano. Por defecto es False.
+
+        Returns:
+        --------
+            dict: Tipo ('grafico') e índice ('indice') del gráfico.
+        """
+        
+        if segundo_plano:
+            
+            tipo = tipo + '_segundo_plano'
+            
+            self.__segundo_plano.add(tipo)
+        
+        indice = self.__indices.get(tipo, 0)
+        
+        self.__indices[tipo] = indice + 1
+        
+        return {'grafico': tipo, 'indice': indice}
+    
+    # Agregar un gráfico al layout
+    def __agregar(self, grafico, contenedor):
+        
+        """
+        Reemplaza los ids de texto de los componentes de un gráfico por ids de 
+        tipo diccionario y lo agrega al layout de la aplicación. Los componentes 
+        se guardan, por su id de texto, hasta que se leen sus valores por 
+        defecto para construir la figura inicial. Con pestañas, el contenedor 
+        se guarda hasta que '__callback' agrega la pestaña del gráfico.
+
+        Parameters:
+        -----------
+        grafico: dict
+                 Identificador devuelto por '__nuevo_grafico'.
+                 
+        contenedor: dash.html.Div
+                    Div con los controles y el dcc.Graph del gráfico.
+
+        Returns:
+        --------
+        None
+        """
+        
+        # Los gráficos en segundo plano muestran un aviso mientras se calculan
+        if grafico['grafico'] in self.__segundo_plano:
+            
+            contenedor.children.append(
+                html.Div('Calculando...', id = 'calculando', style = {'display': 'none'})
+            )
+        
+        # Con pestañas, indica en el navegador si la figura inicial ya se 
+        # construyó
+        if self.__pestannas:
+            
+            contenedor.children.append(dcc.Store(id = 'pagina_abierta', data = False))
+        
+        componentes = {}
+        
+        for componente in contenedor._traverse():
+            
+            if isinstance(getattr(componente, 'id', None), str):
+                
+                componentes[componente.id] = componente
+                
+                componente.id = {'tipo': componente.id, **grafico}
+                
+        self.__componentes[(grafico['grafico'], grafico['indice'])] = componentes
+        
+        if self.__pestannas:
+            
+            self.__contenedores[(grafico['grafico'], grafico['indice'])] = contenedor
+            
+        else:
+            
+            self.__app.layout.children.append(contenedor)
+    
+    # Agregar la pestaña de un gráfico
+    def __agregar_pestanna(self, tipo, indice, titulo):
+        
+        """
+        Agrega la pestaña de un gráfico, con su contenedor, a las pestañas de 
+        la aplicación. La primera pestaña queda seleccionada al cargar la 
+        página. Como el contenedor es parte de la pestaña, el navegador 
+        conserva los valores de sus controles y su figura al cambiar de 
+        pestaña.
+
+        Parameters:
+        -----------
+        tipo: str
+              Tipo del gráfico.
+              
+        indice: int
+                Índice del gráfico dentro de su tipo.
+                
+        titulo: str
+                Título por defecto del gráfico, que se usa como nombre de la 
+                pestaña.
+
+        Returns:
+        --------
+        None
+        """
+        
+        pestannas = self.__app.layout['pestannas_graficos']
+        
+        pestannas.children.append(
+            dcc.Tab(self.__contenedores.pop((tipo, indice)), 
+                    label = titulo if indice == 0 else f'{titulo} ({indice + 1})', 
+                    value = str(len(self.__paginas)))
+        )
+        
+        if not self.__paginas:
+            
+            pestannas.value = '0'
+        
+        self.__paginas.append((tipo, indice))
+    
+    # Registrar el callback de las pestañas de un tipo de gráfico
+    def __registrar_pagina(self, grafico, salida):
+        
+        """
+        Registra el callback que, la primera vez que se abre la pestaña de un 
+        gráfico del tipo dado, construye su figura inicial. El navegador marca 
+        en el dcc.Store 'pagina_abierta' de cada gráfico si su figura ya se 
+        construyó, de modo que al volver a la pestaña no se reemplaza la figura 
+        que corresponde a los controles modificados.
+
+        Parameters:
+        -----------
+        grafico: dict
+                 Identificador del primer gráfico del tipo.
+                 
+        salida: dash.Output
+                Output con la figura del gráfico.
+
+        Returns:
+        --------
+        None
+        """
+        
+        tipo = grafico['grafico']
+        
+        def mostrar_pagina(pagina, abiertas):
+            
+            if pagina is None or self.__paginas[int(pagina)][0] != tipo:
+                
+                raise PreventUpdate
+            
+            indice = self.__paginas[int(pagina)][1]
+            
+            indices = [estado['id']['indice'] for estado in ctx.states_list[0]]
+            
+            posicion = indices.index(indice)
+            
+            if abiertas[posicion]:
+                
+                raise PreventUpdate
+            
+            figuras = [no_update] * len(indices)
+            
+            figuras[posicion] = self.__figura_inicial(tipo, indice)
+            
+            abiertas = [no_update] * len(indices)
+            
+            abiertas[posicion] = True
+            
+            return figuras, abiertas
+        
+        mostrar_pagina.__name__ = 'mostrar_pagina_' + tipo
+        
+        # La primera pestaña se construye al cargar la página
+        self.__app.callback(
+            Output({'tipo': salida.component_id, 'grafico': tipo, 'indice': ALL}, 
+                   salida.component_property, allow_duplicate = True), 
+            Output({'tipo': 'pagina_abierta', 'grafico': tipo, 'indice': ALL}, 'data'), 
+            Input('pestannas_graficos', 'value'), 
+            State({'tipo': 'pagina_abierta', 'grafico': tipo, 'indice': ALL}, 'data'), 
+            prevent_initial_call = 'initial_duplicate'
+        )(mostrar_pagina)
+    
+    # Construir la figura inicial de un gráfico
+    def __figura_inicial(self, tipo, indice):
+        
+        """
+        Construye la figura del gráfico con los valores por defecto de sus 
+        controles.
+
+        Parameters:
+        -----------
+        tipo: str
+              Tipo del gráfico.
+              
+        indice: int
+                Índice del gráfico dentro de su tipo.
+
+        Returns:
+        --------
+            plotly.graph_objects.Figure: Figura inicial del gráfico.
+        """
+        
+        controles = self.__iniciales[(tipo, indice)]
+        
+        componentes = self.__componentes[(tipo, indice)]
+        
+        valores = [getattr(componentes[c.component_id], c.component_property, None) 
+                   for c in controles]
+        
+        return self.__construir_figura(tipo, indice, valores)
+    
+    # Convertir una dependencia en una dependencia de patrón
+    def __patron(self, dependencia, grafico, clase = None, **opciones):
+        
+        """
+        Convierte un Input, State u Output con id de texto en la dependencia 
+        equivalente para todos los gráficos del mismo tipo (índice MATCH).
+
+        Parameters:
+        -----------
+        dependencia: dash.Input, dash.State o dash.Output
+                     Dependencia con el id de texto del componente.
+                     
+        grafico: dict
+                 Identificador devuelto por '__nuevo_grafico'.
+                 
+        clase: type, opcional
+               Clase de la nueva dependencia. Si no se proporciona, se usa la 
+               de 'dependencia'.
+               
+        **opciones: 
+               Argumentos adicionales de la nueva dependencia, por ejemplo 
+               'allow_duplicate'.
+
+        Returns:
+        --------
+            object: Dependencia con id de tipo diccionario.
+        """
+        
+        clase = clase if clase else type(dependencia)
+        
+        return clase({'tipo': dependencia.component_id, 'grafico': grafico['grafico'], 
+                      'indice': MATCH}, dependencia.component_property, **opciones)
+
+    # Registrar los callbacks de un gráfico
+    def __callback(self, grafico, salida, *datos, cosmeticos = (), titulo = None, 
+                   propiedades = ()):
+        
+        """
+        Decorador que registra los callbacks de un gráfico. Los controles se 
+        dividen en dos grupos:
+        
+        - Los controles de 'datos' (bins, imputación, agrupación, ...) 
+          reconstruyen la figura completa. Como cada gráfico es una función 
+          pura de sus controles sobre datos que no cambian, la figura se guarda 
+          en una caché LRU indexada por el gráfico y los valores de los 
+          controles, y se reutiliza cuando se repiten esos valores.
+        - Los controles 'cosmeticos' (tema, título, colores, ...) solo cambian 
+          propiedades del layout o de las trazas, por lo que se envía una 
+          actualización parcial (dash.Patch) en lugar de la figura completa.
+          
+        Los callbacks usan ids de patrón (MATCH) y se registran una sola vez por 
+        tipo de gráfico; la función decorada de cada gráfico se guarda en el 
+        registro de la instancia y el callback la busca con el índice del 
+        gráfico que lo activó. La función decorada recibe los valores de los 
+        controles de datos seguidos de los valores de los controles cosméticos.
+        
+        La figura inicial se construye al registrar el gráfico (con pestañas, 
+        al abrir su pestaña por primera vez), con los valores por defecto de 
+        los controles, y se incluye en el dcc.Graph del layout; los callbacks 
+        no se ejecutan al cargar la página.
+
+        Parameters:
+        -----------
+        grafico: dict
+                 Identificador devuelto por '__nuevo_grafico'.
+                 
+        salida: dash.Output
+                Output con la figura del gráfico.
+                
+        *datos: dash.Input
+                Controles que modifican los datos del gráfico.
+                
+        cosmeticos: list, opcional
+                    Controles cosméticos. Los dos primeros deben ser el tema y 
+                    el título del gráfico; los siguientes se asocian, en orden, 
+                    con los elementos de 'propiedades'.
+                    
+        titulo: str, opcional
+                Título que se muestra cuando no se ingresa uno.
+                
+        propiedades: list, opcional
+                     Una tupla (ruta, tabla) por cada control cosmético después 
+                     del título. 'ruta' es la lista de llaves hasta la propiedad 
+                     de la figura y 'tabla' un diccionario opcional que traduce 
+                     el valor del control (para un dcc.Checklist, True si tiene 
+                     algún valor marcado) en el valor de la propiedad.
+
+        Returns:
+        --------
+            function: Decorador que guarda la función en el registro, construye 
+            la figura inicial y, para el primer gráfico de cada tipo, registra 
+            los callbacks en la aplicación.
+        """
+        
+        tipo, indice = grafico['grafico'], grafico['indice']
+        
+        def decorador(funcion):
+            
+            self.__graficos[(tipo, indice)] = funcion
+            
+            if indice == 0:
+                
+                self.__registrar_callbacks(grafico, funcion.__name__, salida, datos, 
+                                           cosmeticos, titulo, propiedades)
+                
+            # Figura inicial con los valores por defecto de los controles; con 
+            # pestañas, cada navegador la pide al abrir la pestaña
+            self.__iniciales[(tipo, indice)] = [*datos, *cosmeticos]
+            
+            if self.__pestannas:
+                
+                if indice == 0:
+                    
+                    self.__registrar_pagina(grafico, salida)
+                
+                self.__agregar_pestanna(tipo, indice, titulo)
+                
+            else:
+                
+                figura = self.__figura_inicial(tipo, indice)
+                
+                self.__componentes[(tipo, indice)][salida.component_id].figure = figura
+                
+                del self.__iniciales[(tipo, indice)], self.__componentes[(tipo, indice)]
+            
+            return funcion
+        
+        return decorador
+    
+    # Registrar los callbacks de un tipo de gráfico
+    def __registrar_callbacks(self, grafico, nombre, salida, datos, cosmeticos, 
+                              titulo, propiedades):
+        
+        """
+        Registra en la aplicación el callback que construye las figuras y el 
+        callback cosmético de todos los gráficos de un tipo. Los parámetros son 
+        los mismos de '__callback'.
+
+        Parameters:
+        -----------
+        grafico: dict
+                 Identificador del primer gráfico del tipo.
+                 
+        nombre: str
+                Nombre de la función decorada.
+                 
+        salida, datos, cosmeticos, titulo, propiedades:
+                Ver '__callback'.
+
+        Returns:
+        --------
+        None
+        """
+        
+        tipo = grafico['grafico']
+        
+        id_grafico = salida.component_id
+        
+        salida_patron = self.__patron(salida, grafico)
+        
+        estados = [self.__patron(c, grafico, State) for c in cosmeticos]
+        
+        cosmeticos = [self.__patron(c, grafico) for c in cosmeticos]
+        
+        datos = [self.__patron(c, grafico) for c in datos]
+        
+        def construir(*valores):
+            
+            # dcc.Graph envía relayoutData al dibujarse (autosize) y con cambios 
+            # que no mueven los ejes; en esos casos la figura no cambia
+            if all(d['prop_id'].endswith('.relayoutData') and 
+                   not any(llave.startswith(('xaxis', 'yaxis')) for llave in d['value'] or {}) 
+                   for d in ctx.triggered):
+                
+                return no_update
+            
+            # Los gráficos en segundo plano ya se construyen en otro proceso
+            return self.__construir_figura(tipo, ctx.outputs_list['id']['indice'], valores, 
+                                           grupo = tipo not in self.__segundo_plano)
+        
+        def parchear(tema, titulo_grafico, *valores):
+            
+            parche = Patch()
+            
+            parche['layout']['template'] = self.__plantilla(tema)
+            
+            parche['layout']['title']['text'] = titulo_grafico if titulo_grafico else titulo
+            
+            for (ruta, tabla), valor in zip(propiedades, valores):
+                
+                destino = parche
+                
+                for paso in ruta[:-1]:
+                    
+                    destino = destino[paso]
+                    
+                destino[ruta[-1]] = self.__valor_cosmetico(valor, tabla)
+            
+            return parche
+        
+        construir.__name__ = nombre
+        
+        parchear.__name__ = nombre + '_cosmetico'
+        
+        # Los gráficos en segundo plano se construyen en otro proceso; mientras 
+        # tanto se atenúa el gráfico, se muestra el aviso y se pueden cancelar
+        if tipo in self.__segundo_plano:
+            
+            opciones = {'background': True, 
+                        'manager': self.__administrador_segundo_plano(),
+                        'running': [(self.__patron(Output(id_grafico, 'style'), grafico), 
+                                     {'opacity': 0.5}, {'opacity': 1}),
+                                    (self.__patron(Output('calculando', 'style'), grafico), 
+                                     {'display': 'block'}, {'display': 'none'})],
+                        'cancel': [Input('cancelar_graficos', 'n_clicks')]}
+            
+        else:
+            
+            opciones = {}
+        
+        # Si ningún control modifica los datos, basta con la figura inicial
+        if datos:
+            
+            self.__app.callback(salida_patron, *datos, *estados, 
+                                prevent_initial_call = True, **opciones)(construir)
+        
+        if cosmeticos and self.__modo_cliente:
+            
+            self.__agregar_plantillas()
+            
+            configuracion = json.dumps({'titulo': titulo, 
+                                        'propiedades': list(propiedades)})
+            
+            self.__app.clientside_callback(
+                
+                self.__PARCHE_CLIENTE.replace('__CONFIGURACION__', configuracion),
+                self.__patron(salida, grafico, allow_duplicate = True), 
+                *cosmeticos, 
+                self.__patron(salida, grafico, State), 
+                State('plantillas_graficos', 'data'), 
+                prevent_initial_call = True
+                
+            )
+        
+        elif cosmeticos:
+            
+            self.__app.callback(self.__patron(salida, grafico, allow_duplicate = True), 
+                                *cosmeticos, prevent_initial_call = True)(parchear)
+    
+    # Obtener el administrador de los callbacks en segundo plano
+    def __administrador_segundo_plano(self):
+        
+        """
+        Crea, una sola vez, el administrador de los callbacks en segundo plano 
+        con una caché local en disco, y agrega al layout el botón que cancela 
+        los cálculos en curso. Las figuras de estos gráficos se construyen en 
+        otro proceso y no llegan a la caché en memoria, así que se guardan en la 
+        caché en disco. El paquete 'diskcache' solo se importa si algún gráfico 
+        usa callbacks en segundo plano.
+
+        Parameters:
+        -----------
+        None
+
+        Returns:
+        --------
+            dash.DiskcacheManager: Administrador de las tareas en segundo plano.
+        """
+        
+        if self.__administrador is None:
+            
+            try:
+                
+                import diskcache
+                
+            except ImportError as error:
+                
+                raise ImportError("Los gráficos en segundo plano requieren el paquete "
+                                  "'diskcache': pip install 'dash[diskcache]'") from error
+            
+            from dash import DiskcacheManager
+            
+            # Dash identifica cada resultado por el código del callback y los 
+            # valores de los controles; como todos los gráficos de un tipo 
+            # comparten el callback, se agrega el id del gráfico, y un 
+            # identificador de la ejecución para no usar las figuras que queden 
+            # en el directorio de ejecuciones anteriores
+            if self.__max_figuras > 0:
+                
+                ejecucion = uuid.uuid4().hex
+                
+                llaves = [lambda: ejecucion, 
+                          lambda: json.dumps(ctx.outputs_list['id'], sort_keys = True)]
+                
+            else:
+                
+                llaves = None
+            
+            self.__administrador = DiskcacheManager(diskcache.Cache(self.__cache_segundo_plano), 
+                                                    cache_by = llaves)
+            
+            self.__app.layout.children.append(
+                html.Button('Cancelar cálculos', id = 'cancelar_graficos')
+            )
+            
+        return self.__administrador
+    
+    # Construir la figura de un gráfico
+    def __construir_figura(self, tipo, indice, valores, grupo = False):
+        
+        """
+        Construye y serializa la figura de un gráfico para los valores dados de 
+        sus controles, o la devuelve de la caché si ya se construyó.
+
+        Parameters:
+        -----------
+        tipo: str
+              Tipo del gráfico.
+              
+        indice: int
+                Índice del gráfico dentro de su tipo.
+                
+        valores: list
+                 Valores de los controles de datos seguidos de los valores de 
+                 los controles cosméticos.
+                 
+        grupo: bool, opcional
+               Si es True y ya se creó el grupo de procesos (ver 
+               'iniciar_procesos'), la figura se construye en el grupo. Por 
+               defecto es False.
+
+        Returns:
+        --------
+            dict: Figura serializada.
+        """
+        
+        llave = (tipo, indice, self.__llave(valores))
+        
+        with self.__candado:
+            
+            if llave in self.__figuras:
+                
+                self.__figuras.move_to_end(llave)
+                
+                self.__aciertos += 1
+                
+                return self.__figuras[llave][0]
+            
+            self.__fallos += 1
+        
+        # Los gráficos registrados después de crear el grupo no están en los 
+        # procesos y se construyen en el hilo del servidor
+        if grupo and self.__grupo is not None and (tipo, indice) in self.__en_grupo:
+            
+            texto = self.__grupo.submit(_construir_figura_proceso, id(self), tipo, indice, 
+                                        list(valores)).result()
+            
+        else:
+            
+            funcion = self.__graficos[(tipo, indice)]
+            
+            texto = pio.to_json(funcion(*valores), validate = False)
+        
+        figura = json.loads(texto)
+        
+        self.__guardar_figura(llave, figura, len(texto))
+        
+        return figura
+    
+    # Agregar las plantillas de los temas al layout
+    def __agregar_plantillas(self):
+        
+        """
+        Agrega al layout, una sola vez, un dcc.Store con las plantillas de todos 
+        los temas, que usan los callbacks cosméticos del navegador.
+
+        Parameters:
+        -----------
+        None
+
+        Returns:
+        --------
+        None
+        """
+        
+        if not self.__plantillas_cliente:
+            
+            self.__app.layout.children.append(
+                dcc.Store(id = 'plantillas_graficos', 
+                          data = {tema['value']: self.__plantilla(tema['value']) 
+                                  for tema in self.__temas})
+            )
+            
+            self.__plantillas_cliente = True
+    
+    # Obtener una plantilla de plotly
+    def __plantilla(self, tema):
+        
+        """
+        Devuelve la plantilla de plotly del tema dado en formato JSON, para 
+        enviarla en las actualizaciones parciales del layout. Cada plantilla se 
+        serializa una sola vez.
+
+        Parameters:
+        -----------
+        tema: str
+              Nombre del tema, por ejemplo 'plotly_dark'.
+
+        Returns:
+        --------
+            dict: Plantilla del tema.
+        """
+        
+        if tema not in self.__plantillas:
+            
+            self.__plantillas[tema] = json.loads(json.dumps(
+                pio.templates[tema].to_plotly_json(), cls = PlotlyJSONEncoder))
+            
+        return self.__plantillas[tema]
+    
+    # Traducir el valor de un control cosmético
+    def __valor_cosmetico(self, valor, tabla):
+        
+        """
+        Traduce el valor de un control cosmético en el valor de la propiedad de 
+        la figura que modifica.
+
+        Parameters:
+        -----------
+        valor: object
+               Valor del control. Las listas (dcc.Checklist) se interpretan como 
+               True si tienen algún elemento.
+               
+        tabla: dict
+               Diccionario de traducción. Si es None, el valor se usa tal cual.
+
+        Returns:
+        --------
+            object: Valor de la propiedad.
+        """
+        
+        if isinstance(valor, list):
+            
+            valor = len(valor) > 0
+            
+        return valor if tabla is None else tabla[valor]
+    
+
+    # Guardar una figura en la caché
+    def __guardar_figura(self, llave, figura, tamanno):
+        
+        """
+        Guarda una figura en la caché y elimina las usadas hace más tiempo 
+        hasta respetar los límites de número de figuras y de bytes.
+
+        Parameters:
+        -----------
+        llave: tuple
+               Id del gráfico y valores de sus controles.
+               
+        figura: dict
+                Figura serializada.
+                
+        tamanno: int
+                 Tamaño en bytes de la figura en formato JSON.
+
+        Returns:
+        --------
+        None
+        """
+        
+        if self.__max_figuras <= 0 or tamanno > self.__max_bytes_figuras:
+            
+            return
+        
+        with self.__candado:
+            
+            if llave in self.__figuras:
+                
+                self.__bytes_figuras -= self.__figuras.pop(llave)[1]
+            
+            self.__figuras[llave] = (figura, tamanno)
+            
+            self.__bytes_figuras += tamanno
+            
+            while (len(self.__figuras) > self.__max_figuras or 
+                   self.__bytes_figuras > self.__max_bytes_figuras):
+                
+                self.__bytes_figuras -= self.__figuras.popitem(last = False)[1][1]
+
+    # Obtener una estadística de imputación
+    def __estadistica(self, df, columna, metodo):
+
+        """
+        Devuelve la estadística 'metodo' de una columna del DataFrame dado. Cada
+        estadística se calcula la primera vez que se solicita y se guarda para
+        todos los gráficos que usan el mismo DataFrame, ya que los datos
+        registrados no cambian.
+
+        Parameters:
+        -----------
+        df: pandas.DataFrame
+            DataFrame registrado por alguno de los gráficos.
+
+        columna: str
+                 Nombre de la columna sobre la que se calcula la estadística.
+
+        metodo: str
+                Uno de los métodos de imputación: 'mean', 'median', 'max' o 'min'.
+
+        Returns:
+        --------
+            object: Valor de la estadística para la columna dada.
+        """
+
+        # Se guarda el DataFrame junto a sus estadísticas para que su id no
+        # pueda ser reutilizado por otro objeto
+        _, estadisticas = self.__estadisticas.setdefault(id(df), (df, {}))
+
+        if (columna, metodo) not in estadisticas:
+
+            estadisticas[(columna, metodo)] = getattr(df[columna], metodo)()
+
+        return estadisticas[(columna, metodo)]
+
+    # Imputar los valores nulos de las columnas de un gráfico
+    def __imputar(self, df, columnas, metodo = False, imputables = ()):
+
+        """
+        Devuelve un DataFrame con únicamente las columnas que necesita un 
+        gráfico, imputando los valores nulos de las columnas 'imputables'. El 
+        DataFrame original no se copia: solo las columnas imputadas producen 
+        arreglos nuevos y el resto se comparte con los datos registrados.
+
+        Parameters:
+        -----------
+        df: pandas.DataFrame
+            DataFrame registrado por el gráfico.
+
+        columnas: list
+                  Nombres de las columnas que utiliza el gráfico. Se ignoran los 
+                  valores vacíos o False y las columnas repetidas.
+
+        metodo: str, opcional
+                Método de imputación: 'mean', 'median', 'max' o 'min'. Si no se 
+                proporciona, no se imputa ninguna columna. Por defecto es False.
+
+        imputables: list, opcional
+                    Columnas en las que se imputarán los valores nulos.
+
+        Returns:
+        --------
+            pandas.DataFrame: DataFrame con las columnas solicitadas.
+        """
+
+        # El método llega del navegador y se usa como nombre de un método de 
+        # pandas, así que solo se aceptan los del menú de imputación; con otro 
+        # valor el gráfico no cambia
+        if metodo and metodo not in [opcion['value'] for opcion in self.__metodos]:
+            
+            raise PreventUpdate
+
+        datos = {}
+
+        for columna in columnas:
+
+            if columna and columna not in datos:
+
+                serie = df[columna]
+
+                if metodo and columna in imputables:
+
+                    serie = serie.fillna(self.__estadistica(df, columna, metodo))
+
+                datos[columna] = serie
+
+        return pd.DataFrame(datos, copy = False)
+
+    # Obtener las filas de cada categoría
+    def __indice_grupos(self, df, variable_agrupar):
+
+        """
+        Calcula una sola vez las posiciones de las filas de cada categoría de 
+        'variable_agrupar', para que los callbacks seleccionen los datos de una 
+        categoría sin recorrer toda la columna con una máscara booleana.
+
+        Parameters:
+        -----------
+        df: pandas.DataFrame
+            DataFrame registrado por el gráfico.
+
+        variable_agrupar: str
+                          Nombre de la columna que define las categorías.
+
+        Returns:
+        --------
+            dict: Posiciones (numpy.ndarray) de las filas de cada categoría.
+        """
+
+        return df.groupby(variable_agrupar, sort = False, observed = True).indices
+
+    # Ordenar los valores de un histograma
+    def __ordenar(self, df, variable_x, variable_y = False):
+
+        """
+        Ordena una sola vez los valores no nulos de 'variable_x' y acumula los 
+        valores de 'variable_y' en ese orden, para calcular después cualquier 
+        histograma con búsquedas binarias. Las fechas se ordenan como números 
+        (ver '__numeros').
+
+        Parameters:
+        -----------
+        df: pandas.DataFrame
+            DataFrame con los datos de una categoría.
+
+        variable_x: str
+                    Nombre de la columna que se agrupa en los bins.
+
+        variable_y: str, opcional
+                    Nombre de la columna que se suma en cada bin. Por defecto 
+                    es False.
+
+        Returns:
+        --------
+            tuple: Valores ordenados de 'variable_x', sumas acumuladas de 
+            'variable_y' (None si no se proporciona 'variable_y') y función que 
+            convierte los bordes de los bins a los valores del eje.
+        """
+
+        validos = df[variable_x].notna().to_numpy()
+
+        x, convertir = self.__numeros(df[variable_x][validos])
+
+        orden = np.argsort(x, kind = 'stable')
+
+        acumulado = None
+
+        if variable_y:
+
+            # Los valores nulos de 'variable_y' no suman, como en plotly
+            y = np.nan_to_num(df[variable_y].to_numpy(dtype = float)[validos][orden])
+
+            acumulado = np.concatenate([[0], np.cumsum(y)])
+
+        return x[orden], acumulado, convertir
+
+    # Contar las observaciones de cada categoría
+    def __contar_categorias(self, df, variable_x, variable_y = False):
+
+        """
+        Cuenta las observaciones de cada valor de una columna de texto o 
+        categórica y suma 'variable_y' en cada una, para dibujar una barra por 
+        categoría. Las columnas categóricas conservan el orden de sus 
+        categorías y las de texto el orden en que aparecen, como en plotly.
+
+        Parameters:
+        -----------
+        df: pandas.DataFrame
+            DataFrame con los datos de una categoría.
+
+        variable_x: str
+                    Nombre de la columna que se cuenta.
+
+        variable_y: str, opcional
+                    Nombre de la columna que se suma en cada categoría. Por 
+                    defecto es False.
+
+        Returns:
+        --------
+            tuple: Lista de categorías, número de observaciones de cada una y 
+            sumas de 'variable_y' (None si no se proporciona 'variable_y').
+        """
+
+        grupos = df.groupby(variable_x, observed = True, 
+                            sort = isinstance(df[variable_x].dtype, pd.CategoricalDtype))
+
+        conteos = grupos.size()
+
+        sumas = None
+
+        if variable_y:
+
+            # Los valores nulos de 'variable_y' no suman, como en plotly
+            sumas = grupos[variable_y].sum().to_numpy(dtype = float)
+
+        return list(conteos.index), conteos.to_numpy(), sumas
+
+    # Calcular un histograma
+    def __histograma(self, ordenados, bins, acumulado = None):
+
+        """
+        Calcula un histograma con bins de igual ancho entre el mínimo y el 
+        máximo de los datos, igual que numpy.histogram. Como los valores ya 
+        están ordenados, cada borde se ubica con una búsqueda binaria y el 
+        costo es O(bins · log n) en lugar de O(n).
+
+        Parameters:
+        -----------
+        ordenados: numpy.ndarray
+                   Valores sin nulos y ordenados (ver '__ordenar').
+
+        bins: int
+              Número de bins del histograma.
+
+        acumulado: numpy.ndarray, opcional
+                   Sumas acumuladas del valor que suma cada observación. Si no 
+                   se proporciona, se cuenta el número de observaciones de 
+                   cada bin. Por defecto es None.
+
+        Returns:
+        --------
+            tuple: Bordes de los bins (bins + 1 valores) y altura de cada bin.
+        """
+
+        if ordenados.size == 0:
+
+            minimo, maximo = 0.0, 1.0
+
+        else:
+
+            minimo, maximo = ordenados[0], ordenados[-1]
+
+        if minimo == maximo:
+
+            minimo, maximo = minimo - 0.5, maximo + 0.5
+
+        bordes = np.linspace(minimo, maximo, bins + 1)
+
+        # Los bins incluyen su borde izquierdo; el último también el derecho
+        posiciones = np.searchsorted(ordenados, bordes, side = 'left')
+
+        posiciones[-1] = ordenados.size
+
+        if acumulado is None:
+
+            return bordes, np.diff(posiciones)
+
+        return bordes, np.diff(acumulado[posiciones])
+
+    # Convertir una columna en fechas
+    def __fechas(self, serie):
+
+        """
+        Devuelve la columna como fechas si es de tipo fecha o si es texto que 
+        se puede interpretar como fechas, como la columna 'date' de 
+        plotly.express.data.stocks(). El formato se deduce del primer valor, 
+        así que el texto que no parece una fecha no se intenta convertir.
+
+        Parameters:
+        -----------
+        serie: pandas.Series
+               Columna del DataFrame.
+
+        Returns:
+        --------
+            pandas.Series: Columna convertida en fechas, o None si la columna no 
+            contiene fechas.
+        """
+
+        if serie.dtype == object:
+
+            muestra = serie.dropna()
+            
+            if muestra.empty or not isinstance(muestra.iloc[0], str):
+
+                return None
+
+            formato = guess_datetime_format(muestra.iloc[0])
+            
+            if formato is None:
+
+                return None
+
+            try:
+
+                serie = pd.to_datetime(serie, format = formato)
+
+            except (ValueError, TypeError):
+
+                return None
+
+        if pd.api.types.is_datetime64_any_dtype(serie):
+
+            return serie
+
+        return None
+
+    # Convertir una columna en valores numéricos
+    def __numeros(self, serie):
+
+        """
+        Convierte una columna sin nulos en un arreglo de números de punto 
+        flotante para calcular bins o densidades. Las fechas (también las que 
+        vienen como texto) se convierten en nanosegundos desde 1970.
+
+        Parameters:
+        -----------
+        serie: pandas.Series
+               Columna sin valores nulos.
+
+        Returns:
+        --------
+            tuple: Arreglo de números y función que convierte de vuelta los 
+            números calculados (por ejemplo, los centros de los bins) a los 
+            valores del eje.
+        """
+
+        fechas = self.__fechas(serie)
+
+        if fechas is not None:
+
+            nanosegundos = fechas.to_numpy(dtype = 'datetime64[ns]').astype('int64')
+
+            return nanosegundos.astype(float), lambda valores: pd.to_datetime(valores.astype('int64'))
+
+        return serie.to_numpy(dtype = float), lambda valores: valores
+
+    # Calcular un histograma de dos dimensiones
+    def __histograma_2d(self, x, y, bins_x, bins_y, rangos = None, pesos = None):
+
+        """
+        Cuenta las observaciones de cada celda de una cuadrícula de bins de 
+        igual ancho entre el mínimo y el máximo de cada eje. Si todos los 
+        valores de un eje son iguales, su rango se amplía en 0.5 a cada lado.
+
+        Parameters:
+        -----------
+        x: numpy.ndarray
+           Valores sin nulos del eje x.
+
+        y: numpy.ndarray
+           Valores sin nulos del eje y, en el mismo orden que 'x'.
+
+        bins_x: int
+                Número de bins en el eje x.
+
+        bins_y: int
+                Número de bins en el eje y.
+
+        rangos: list, opcional
+                Rango (mínimo, máximo) de cada eje. Un rango None se calcula 
+                con los datos y las observaciones fuera del rango se ignoran. 
+                Por defecto es None.
+
+        pesos: numpy.ndarray, opcional
+               Valor que suma cada observación en lugar de contar 1. Por 
+               defecto es None.
+
+        Returns:
+        --------
+            tuple: Bordes de los bins en x, bordes de los bins en y y conteos 
+            (o sumas de 'pesos') con una fila por bin del eje y.
+        """
+
+        rangos = list(rangos) if rangos else [None, None]
+
+        for i, valores in enumerate((x, y)):
+
+            if rangos[i] is None:
+
+                rangos[i] = (valores.min(), valores.max()) if valores.size else (0.0, 1.0)
+
+            minimo, maximo = rangos[i]
+
+            if minimo == maximo:
+
+                rangos[i] = (minimo - 0.5, maximo + 0.5)
+
+        conteos, bordes_x, bordes_y = np.histogram2d(x, y, bins = [bins_x, bins_y], 
+                                                     range = rangos, weights = pesos)
+
+        if pesos is None:
+
+            conteos = conteos.astype(int)
+
+        return bordes_x, bordes_y, conteos.T
+
+    # Preparar un eje para contar observaciones
+    def __eje_conteos(self, serie):
+
+        """
+        Prepara una columna sin nulos como eje de un mapa de calor o de un 
+        contorno. Los ejes numéricos y de fechas se dividen en bins; los demás 
+        se tratan como categóricos, con una celda por categoría en orden de 
+        aparición.
+
+        Parameters:
+        -----------
+        serie: pandas.Series
+               Columna sin valores nulos.
+
+        Returns:
+        --------
+            tuple: Valores del eje (números de punto flotante, o códigos de 
+            categoría si el eje es categórico), función que convierte los 
+            centros de los bins a los valores del eje y lista de categorías 
+            (None si el eje no es categórico).
+        """
+
+        if pd.api.types.is_numeric_dtype(serie) or self.__fechas(serie) is not None:
+
+            return (*self.__numeros(serie), None)
+
+        codigos, categorias = pd.factorize(serie)
+
+        return codigos, None, list(categorias)
+
+    # Contar las observaciones de una cuadrícula
+    def __conteos_2d(self, eje_x, eje_y, bins_x, bins_y):
+
+        """
+        Cuenta las observaciones de cada celda de la cuadrícula formada por dos 
+        ejes preparados con '__eje_conteos'. Los ejes categóricos tienen una 
+        celda por categoría y no usan su número de bins.
+
+        Parameters:
+        -----------
+        eje_x: tuple
+               Eje x devuelto por '__eje_conteos'.
+
+        eje_y: tuple
+               Eje y devuelto por '__eje_conteos'.
+
+        bins_x: int
+                Número de bins en el eje x, si es numérico.
+
+        bins_y: int
+                Número de bins en el eje y, si es numérico.
+
+        Returns:
+        --------
+            tuple: Valores del eje x, valores del eje y y conteos con una fila 
+            por valor del eje y.
+        """
+
+        (x, convertir_x, categorias_x), (y, convertir_y, categorias_y) = eje_x, eje_y
+
+        if categorias_x is None and categorias_y is None:
+
+            bordes_x, bordes_y, z = self.__histograma_2d(x, y, bins_x, bins_y)
+
+            return (convertir_x((bordes_x[:-1] + bordes_x[1:]) / 2), 
+                    convertir_y((bordes_y[:-1] + bordes_y[1:]) / 2), z)
+
+        codigos, etiquetas = [], []
+
+        for valores, convertir, categorias, bins in ((x, convertir_x, categorias_x, bins_x), 
+                                                     (y, convertir_y, categorias_y, bins_y)):
+
+            if categorias is None:
+
+                # Los mismos bins de igual ancho que '__histograma_2d'
+                bordes = np.histogram_bin_edges(valores, bins)
+
+                codigos.append(np.clip(np.searchsorted(bordes, valores, side = 'right') - 1, 
+                                       0, bins - 1))
+
+                etiquetas.append(convertir((bordes[:-1] + bordes[1:]) / 2))
+
+            else:
+
+                codigos.append(valores)
+
+                etiquetas.append(categorias)
+
+        n_x, n_y = len(etiquetas[0]), len(etiquetas[1])
+
+        z = np.bincount(codigos[1] * n_x + codigos[0], minlength = n_x * n_y).reshape(n_y, n_x)
+
+        return etiquetas[0], etiquetas[1], z
+
+    # Convertir una cuadrícula de valores en una imagen PNG
+    def __imagen_png(self, z, escala):
+
+        """
+        Colorea una cuadrícula de valores con una escala de colores y la 
+        codifica como una imagen PNG de paleta (un byte por celda) en base64. 
+        Las celdas sin valor (NaN) quedan transparentes y la primera fila de la 
+        cuadrícula es la primera fila de la imagen.
+
+        Parameters:
+        -----------
+        z: numpy.ndarray
+           Cuadrícula de valores de tamaño (alto, ancho).
+
+        escala: list
+                Escala de colores de plotly, como lista de colores o de pares 
+                (posición, color).
+
+        Returns:
+        --------
+            tuple: URL de datos de la imagen, y valores mínimo y máximo de la 
+            escala de colores.
+        """
+
+        validos = np.isfinite(z)
+        
+        if validos.any():
+            
+            minimo, maximo = float(z[validos].min()), float(z[validos].max())
+            
+        else:
+            
+            minimo, maximo = 0.0, 0.0
+            
+        # El color 0 de la paleta es transparente y los otros 255 recorren la 
+        # escala del mínimo al máximo
+        paleta = np.zeros((256, 3), dtype = np.uint8)
+        paleta[1:] = [px.colors.unlabel_rgb(color) for color in 
+                      px.colors.sample_colorscale(escala, np.linspace(0, 1, 255))]
+        
+        indices = np.zeros(z.shape, dtype = np.uint8)
+        
+        if maximo > minimo:
+            
+            indices[validos] = 1 + np.round((z[validos] - minimo) / (maximo - minimo) * 254)
+            
+        else:
+            
+            indices[validos] = 1
+        
+        # Cada fila del PNG empieza con el tipo de filtro (0, sin filtro)
+        filas = np.hstack([np.zeros((z.shape[0], 1), dtype = np.uint8), indices])
+        
+        def bloque(tipo, datos):
+            
+            return (struct.pack('>I', len(datos)) + tipo + datos + 
+                    struct.pack('>I', zlib.crc32(tipo + datos)))
+        
+        png = (b'\x89PNG\r\n\x1a\n' + 
+               bloque(b'IHDR', struct.pack('>IIBBBBB', z.shape[1], z.shape[0], 8, 3, 0, 0, 0)) + 
+               bloque(b'PLTE', paleta.tobytes()) + 
+               bloque(b'tRNS', b'\x00') + 
+               bloque(b'IDAT', zlib.compress(filas.tobytes(), 9)) + 
+               bloque(b'IEND', b''))
+        
+        return 'data:image/png;base64,' + base64.b64encode(png).decode(), minimo, maximo
+
+    # Obtener el rango visible de un eje
+    def __rango_visible(self, relayout, eje):
+
+        """
+        Lee el rango de un eje de los datos de 'relayoutData' de un dcc.Graph, 
+        es decir, la región que el usuario dejó visible al hacer zoom.
+
+        Parameters:
+        -----------
+        relayout: dict
+                  Valor de la propiedad 'relayoutData' del gráfico, o None.
+
+        eje: str
+             Nombre del eje en plotly, por ejemplo 'xaxis' o 'yaxis'.
+
+        Returns:
+        --------
+            list: Mínimo y máximo visibles en las unidades del eje (las fechas 
+            como pandas.Timestamp), o None si el eje muestra todos los datos.
+        """
+
+        if not relayout or relayout.get(eje + '.autorange'):
+
+            return None
+
+        if eje + '.range[0]' in relayout and eje + '.range[1]' in relayout:
+
+            rango = [relayout[eje + '.range[0]'], relayout[eje + '.range[1]']]
+
+        elif eje + '.range' in relayout:
+
+            rango = list(relayout[eje + '.range'])
+
+        else:
+
+            return None
+
+        # En los ejes de fechas plotly envía el rango como texto
+        return [pd.Timestamp(valor) if isinstance(valor, str) else valor for valor in rango]
+
+    # Calcular una curva de densidad
+    def __curva_densidad(self, valores, curva = 'kde', puntos = 500, ancho = None, 
+                         margen = 0):
+
+        """
+        Evalúa una curva de densidad en 'puntos' valores equiespaciados desde 
+        el mínimo hasta el máximo de los datos. La estimación por kernel usa un
+        kernel gaussiano, por defecto con el ancho de banda de Scott 
+        (desviación estándar muestral por n^(-1/5)), como 
+        scipy.stats.gaussian_kde, pero los datos se agrupan linealmente en la 
+        cuadrícula y se convolucionan con el kernel mediante FFT, de modo que 
+        el costo es O(n + puntos · log puntos) en lugar de O(n · puntos).
+
+        Parameters:
+        -----------
+        valores: numpy.ndarray
+                 Valores sin nulos de una categoría.
+
+        curva: str, opcional
+               'kde' para la estimación por kernel o 'normal' para la densidad 
+               normal con la media y la desviación estándar de los datos. Por 
+               defecto es 'kde'.
+
+        puntos: int, opcional
+                Número de puntos de la curva. Por defecto es 500.
+
+        ancho: float, opcional
+               Ancho de banda del kernel. Si no se proporciona, se usa la regla 
+               de Scott. Por defecto es None.
+
+        margen: float, opcional
+                Número de anchos de banda que la curva se extiende más allá del 
+                mínimo y del máximo de los datos. Por defecto es 0.
+
+        Returns:
+        --------
+            tuple: Valores del eje x y densidad en cada uno de ellos.
+        """
+
+        if valores.size == 0:
+
+            return np.empty(0), np.empty(0)
+
+        if ancho is None and curva != 'normal':
+
+            desviacion = valores.std(ddof = 1) if valores.size > 1 else 0
+
+            ancho = desviacion * valores.size ** (-1 / 5)
+
+        minimo = valores.min() - margen * (ancho or 0)
+        maximo = valores.max() + margen * (ancho or 0)
+
+        paso = (maximo - minimo) / puntos
+
+        x = minimo + paso * np.arange(puntos)
+
+        if curva == 'normal':
+
+            media, desviacion = valores.mean(), valores.std()
+
+            if desviacion == 0:
+
+                return x, np.zeros(puntos)
+
+            return x, np.exp(-0.5 * ((x - media) / desviacion) ** 2) / (desviacion * np.sqrt(2 * np.pi))
+
+        if not ancho > 0:
+
+            return x, np.zeros(puntos)
+
+        # Agrupamiento lineal: cada valor reparte su peso entre los dos puntos 
+        # vecinos de la cuadrícula (el máximo cae en el punto 'puntos')
+        posicion = (valores - minimo) / paso
+
+        izquierda = np.minimum(np.floor(posicion).astype(int), puntos - 1)
+
+        peso = posicion - izquierda
+
+        conteos = (np.bincount(izquierda, 1 - peso, minlength = puntos + 1) +
+                   np.bincount(izquierda + 1, peso, minlength = puntos + 1))
+
+        # El kernel se trunca a cinco anchos de banda
+        alcance = int(min(puntos, np.ceil(5 * ancho / paso)))
+
+        desplazamientos = paso * np.arange(-alcance, alcance + 1)
+
+        kernel = np.exp(-0.5 * (desplazamientos / ancho) ** 2) / (ancho * np.sqrt(2 * np.pi))
+
+        largo = conteos.size + kernel.size - 1
+
+        convolucion = np.fft.irfft(np.fft.rfft(conteos, largo) * np.fft.rfft(kernel, largo), largo)
+
+        y = np.maximum(convolucion[alcance:alcance + puntos], 0) / valores.size
+
+        return x, y
+
+    # Calcular las estadísticas de una caja
+    def __caja(self, valores):
+
+        """
+        Calcula los cuartiles, los bigotes y los valores atípicos de una caja 
+        con las mismas reglas que plotly.js: cuartiles con el método 'hazen' 
+        (el método 'linear' de plotly) y bigotes hasta el último valor dentro 
+        de 1.5 veces el rango intercuartílico.
+
+        Parameters:
+        -----------
+        valores: numpy.ndarray
+                 Valores ordenados y sin nulos de la caja.
+
+        Returns:
+        --------
+            tuple: q1, mediana, q3, bigote inferior, bigote superior y el 
+            arreglo de valores atípicos.
+        """
+
+        q1, mediana, q3 = np.quantile(valores, [0.25, 0.5, 0.75], method = 'hazen')
+
+        limite_inferior = q1 - 1.5 * (q3 - q1)
+        limite_superior = q3 + 1.5 * (q3 - q1)
+
+        dentro = valores[(valores >= limite_inferior) & (valores <= limite_superior)]
+
+        return (q1, mediana, q3, min(q1, dentro[0]), max(q3, dentro[-1]),
+                valores[(valores < limite_inferior) | (valores > limite_superior)])
+
+    # Resumir los datos de un gráfico de cajas
+    def __resumir_cajas(self, df, variable_y, grupos):
+
+        """
+        Calcula las estadísticas de cada caja (ver '__caja') de una sola 
+        pasada, agrupando las filas por las columnas de 'grupos'.
+
+        Parameters:
+        -----------
+        df: pandas.DataFrame
+            DataFrame con las columnas del gráfico.
+
+        variable_y: str
+                    Nombre de la columna numérica que se resume.
+
+        grupos: list
+                Columnas que definen cada caja, por ejemplo la categoría del 
+                eje x y la categoría del color.
+
+        Returns:
+        --------
+            dict: Estadísticas de la caja de cada combinación de 'grupos' 
+            (siempre una tupla), en orden de aparición.
+        """
+
+        datos = df.dropna(subset = [variable_y] + grupos)
+
+        y = datos[variable_y].to_numpy(dtype = float)
+
+        resumen = {}
+
+        for grupo, posiciones in datos.groupby(grupos, sort = False, observed = True).indices.items():
+
+            if not isinstance(grupo, tuple):
+
+                grupo = (grupo,)
+
+            resumen[grupo] = self.__caja(np.sort(y[posiciones]))
+
+        return resumen
+
+    # Resumir los datos de un gráfico de violines
+    def __resumir_violines(self, df, variable_y, grupos, puntos = 100, muestra = 200):
+
+        """
+        Calcula la forma de cada violín con las reglas de plotly.js: una 
+        estimación por kernel con el ancho de banda de Silverman (como mínimo 
+        una centésima del rango) que se extiende dos anchos de banda más allá 
+        de los datos. Además calcula las estadísticas de la caja interior y 
+        toma una muestra fija de puntos, de modo que cada violín tiene el 
+        mismo tamaño sin importar el número de filas.
+
+        Parameters:
+        -----------
+        df: pandas.DataFrame
+            DataFrame con las columnas del gráfico.
+
+        variable_y: str
+                    Nombre de la columna numérica que se resume.
+
+        grupos: list
+                Columnas que definen cada violín, por ejemplo la categoría del 
+                eje x y la categoría del color.
+
+        puntos: int, opcional
+                Número de puntos de la curva de cada violín. Por defecto es 100.
+
+        muestra: int, opcional
+                 Número máximo de observaciones que se dibujan en cada violín. 
+                 Por defecto es 200.
+
+        Returns:
+        --------
+            dict: Para cada combinación de 'grupos' (siempre una tupla), en 
+            orden de aparición, una tupla con los valores del eje y de la 
+            curva, su densidad relativa (máximo 1), las estadísticas de la 
+            caja (ver '__caja') y la muestra de observaciones.
+        """
+
+        datos = df.dropna(subset = [variable_y] + grupos)
+
+        y = datos[variable_y].to_numpy(dtype = float)
+
+        # Semilla fija para que la muestra no cambie entre llamadas
+        generador = np.random.default_rng(0)
+
+        resumen = {}
+
+        for grupo, posiciones in datos.groupby(grupos, sort = False, observed = True).indices.items():
+
+            if not isinstance(grupo, tuple):
+
+                grupo = (grupo,)
+
+            valores = np.sort(y[posiciones])
+
+            caja = self.__caja(valores)
+
+            rango = valores[-1] - valores[0]
+
+            desviacion = valores.std(ddof = 1) if valores.size > 1 else 0
+
+            ancho = max(1.059 * min(desviacion, (caja[2] - caja[0]) / 1.349) * valores.size ** (-1 / 5),
+                        rango / 100)
+
+            curva_y, densidad = self.__curva_densidad(valores, puntos = puntos, 
+                                                      ancho = ancho, margen = 2)
+
+            if densidad.max() > 0:
+
+                densidad = densidad / densidad.max()
+
+            if valores.size > muestra:
+
+                valores = generador.choice(valores, muestra, replace = False)
+
+            resumen[grupo] = (curva_y, densidad, caja, valores)
+
+        return resumen
+
+    # Preparar las series de un gráfico de líneas o áreas
+    def __preparar_series(self, df, variable_x, variable_y, variable_agrupar, max_puntos):
+
+        """
+        Separa las filas de cada categoría de 'variable_agrupar'. Las series 
+        con más de 'max_puntos' filas se ordenan por 'variable_x', sin nulos, y 
+        se guardan junto con sus valores numéricos de x para reducirlas 
+        después (ver '__reducir_series'); el resto se conserva tal cual.
+
+        Parameters:
+        -----------
+        df: pandas.DataFrame
+            DataFrame con las columnas del gráfico.
+
+        variable_x: str
+                    Nombre de la columna del eje x.
+
+        variable_y: str
+                    Nombre de la columna del eje y.
+
+        variable_agrupar: str
+                          Nombre de la columna que define cada serie.
+
+        max_puntos: int
+                    Número máximo de puntos por serie.
+
+        Returns:
+        --------
+            list: Una tupla (filas, x) por serie, en orden de aparición. 'x' es 
+            None en las series que no se reducen.
+        """
+
+        series = []
+
+        for posiciones in df.groupby(variable_agrupar, sort = False, observed = True).indices.values():
+
+            serie = df.take(posiciones)
+
+            if len(serie) <= max_puntos:
+
+                series.append((serie, None))
+
+                continue
+
+            serie = serie.dropna(subset = [variable_x, variable_y])
+
+            x = self.__numeros(serie[variable_x])[0]
+
+            orden = np.argsort(x, kind = 'stable')
+
+            series.append((serie.take(orden), x[orden]))
+
+        return series
+
+    # Agregar las series por periodos de tiempo
+    def __niveles_fechas(self, df, variable_x, variable_y, variable_agrupar):
+
+        """
+        Calcula el promedio de 'variable_y' de cada serie por día, semana, mes 
+        y año, para dibujar ejes de fechas largos con el nivel de detalle que 
+        corresponde al rango visible (ver '__reducir_series').
+
+        Parameters:
+        -----------
+        df: pandas.DataFrame
+            DataFrame con las columnas del gráfico.
+
+        variable_x: str
+                    Nombre de la columna de fechas del eje x.
+
+        variable_y: str
+                    Nombre de la columna del eje y.
+
+        variable_agrupar: str
+                          Nombre de la columna que define cada serie.
+
+        Returns:
+        --------
+            dict: Un DataFrame por frecuencia de '__NIVELES_FECHAS', con las 
+            series en orden de aparición y ordenadas por fecha.
+        """
+
+        datos = pd.DataFrame({variable_agrupar: df[variable_agrupar], 
+                              variable_x: self.__fechas(df[variable_x]),
+                              variable_y: df[variable_y]}, copy = False)
+
+        niveles = {}
+
+        for frecuencia, _ in self.__NIVELES_FECHAS:
+
+            nivel = (datos.groupby([variable_agrupar, pd.Grouper(key = variable_x, freq = frecuencia)],
+                                   sort = False, observed = True)[variable_y]
+                     .mean().dropna().reset_index())
+
+            orden = np.lexsort((nivel[variable_x].to_numpy(), 
+                                pd.factorize(nivel[variable_agrupar])[0]))
+
+            niveles[frecuencia] = nivel.take(orden)
+
+        return niveles
+
+    # Reducir el número de puntos de las series
+    def __reducir_series(self, series, variable_x, variable_y, max_puntos, 
+                         visible = None, niveles = None):
+
+        """
+        Reduce cada serie preparada por '__preparar_series' a 'max_puntos' 
+        puntos con el algoritmo Largest-Triangle-Three-Buckets, que conserva la 
+        forma de la curva. Si se proporciona un rango visible, solo se reducen 
+        las filas dentro de ese rango (más un punto a cada lado), de modo que 
+        al hacer zoom se recupera el detalle.
+
+        En los ejes de fechas con niveles de detalle, si alguna serie tiene más 
+        de 'max_puntos' filas en el rango, se devuelve en su lugar el nivel 
+        más fino (día, semana, mes o año) que no supera 'max_puntos' periodos.
+
+        Parameters:
+        -----------
+        series: list
+                Series devueltas por '__preparar_series'.
+
+        variable_x: str
+                    Nombre de la columna del eje x.
+
+        variable_y: str
+                    Nombre de la columna del eje y.
+
+        max_puntos: int
+                    Número máximo de puntos por serie.
+
+        visible: list, opcional
+                 Rango visible del eje x (ver '__rango_visible'). Por defecto 
+                 es None.
+
+        niveles: dict, opcional
+                 Series agregadas por periodo (ver '__niveles_fechas'). Por 
+                 defecto es None.
+
+        Returns:
+        --------
+            pandas.DataFrame: Filas seleccionadas de todas las series.
+        """
+
+        if visible is not None:
+
+            visible = self.__numeros(pd.Series(visible))[0]
+
+        if niveles is not None:
+
+            largas = [x for _, x in series if x is not None]
+
+            if visible is None:
+
+                limites = (min(x[0] for x in largas), max(x[-1] for x in largas))
+
+            else:
+
+                limites = visible
+
+            filas = max(np.searchsorted(x, limites[1], side = 'right') - 
+                        np.searchsorted(x, limites[0], side = 'left') for x in largas)
+
+            if filas > max_puntos:
+
+                dias = (limites[1] - limites[0]) / (24 * 3600 * 1e9)
+
+                for frecuencia, duracion in self.__NIVELES_FECHAS:
+
+                    if dias / duracion <= max_puntos:
+
+                        break
+
+                nivel = niveles[frecuencia]
+
+                fechas = nivel[variable_x]
+
+                # Un periodo más a cada lado para que las líneas lleguen a los bordes
+                margen = pd.Timedelta(days = duracion)
+
+                return nivel[(fechas >= pd.Timestamp(int(limites[0])) - margen) & 
+                             (fechas <= pd.Timestamp(int(limites[1])) + margen)]
+
+        partes = []
+
+        for serie, x in series:
+
+            if x is not None:
+
+                if visible is not None:
+
+                    inicio = max(np.searchsorted(x, visible[0], side = 'left') - 1, 0)
+                    fin = np.searchsorted(x, visible[1], side = 'right') + 1
+
+                    serie, x = serie.iloc[inicio:fin], x[inicio:fin]
+
+                if len(serie) > max_puntos:
+
+                    serie = serie.take(self.__lttb(x, serie[variable_y].to_numpy(dtype = float), 
+                                                   max_puntos))
+
+            partes.append(serie)
+
+        return pd.concat(partes)
+
+    # Seleccionar los puntos de una serie con LTTB
+    def __lttb(self, x, y, puntos):
+
+        """
+        Algoritmo Largest-Triangle-Three-Buckets: conserva el primer y el 
+        último punto y divide el resto en 'puntos' - 2 grupos consecutivos. De 
+        cada grupo elige el punto que forma el triángulo de mayor área con el 
+        punto elegido antes y con el promedio del grupo siguiente.
+
+        Parameters:
+        -----------
+        x: numpy.ndarray
+           Valores ordenados del eje x.
+
+        y: numpy.ndarray
+           Valores del eje y, sin nulos.
+
+        puntos: int
+                Número de puntos que se conservan.
+
+        Returns:
+        --------
+            numpy.ndarray: Posiciones de los puntos elegidos.
+        """
+
+        n = x.size
+
+        if puntos >= n or puntos < 3:
+
+            return np.arange(n)
+
+        limites = np.linspace(1, n - 1, puntos - 1).astype(int)
+
+        seleccion = np.empty(puntos, dtype = int)
+
+        seleccion[0], seleccion[-1] = 0, n - 1
+
+        elegido = 0
+
+        for i in range(puntos - 2):
+
+            inicio, fin = limites[i], limites[i + 1]
+
+            siguiente = limites[i + 2] if i + 2 < limites.size else n
+
+            promedio_x, promedio_y = x[fin:siguiente].mean(), y[fin:siguiente].mean()
+
+            areas = np.abs((x[elegido] - promedio_x) * (y[inicio:fin] - y[elegido]) -
+                           (x[elegido] - x[inicio:fin]) * (promedio_y - y[elegido]))
+
+            elegido = inicio + np.argmax(areas)
+
+            seleccion[i + 1] = elegido
+
+        return seleccion
+
+    # Ajustar rectas de regresión por mínimos cuadrados
+    def __ajustar_rectas(self, df, variable_x, variable_y, variable_agrupar = False):
+
+        """
+        Ajusta una recta de mínimos cuadrados ordinarios por cada categoría de 
+        'variable_agrupar' con las fórmulas cerradas de la pendiente, el 
+        intercepto y el R², calculando las sumas de todas las categorías a la 
+        vez con numpy.bincount. Las filas con valores nulos en x o y se 
+        ignoran, como en plotly express.
+
+        Parameters:
+        -----------
+        df: pandas.DataFrame
+            DataFrame con las columnas del gráfico.
+
+        variable_x: str
+                    Nombre de la columna del eje x.
+
+        variable_y: str
+                    Nombre de la columna del eje y.
+
+        variable_agrupar: str, opcional
+                          Nombre de la columna que define cada recta. Si no se 
+                          proporciona, se ajusta una sola recta. Por defecto es 
+                          False.
+
+        Returns:
+        --------
+            list: Una tupla por categoría, en orden de aparición, con la 
+            pendiente, el intercepto, el R² y los valores de x e y de los 
+            extremos de la recta, o None si la categoría no tiene al menos dos 
+            valores distintos de x.
+        """
+
+        if variable_agrupar:
+
+            codigos, grupos = pd.factorize(df[variable_agrupar])
+
+        else:
+
+            codigos, grupos = np.zeros(len(df), dtype = int), [None]
+
+        validos = df[variable_x].notna().to_numpy() & df[variable_y].notna().to_numpy() & (codigos >= 0)
+
+        x, eje_x = self.__numeros(df[variable_x][validos])
+        y = df[variable_y][validos].to_numpy(dtype = float)
+
+        codigos = codigos[validos]
+
+        k = len(grupos)
+
+        n = np.bincount(codigos, minlength = k)
+
+        with np.errstate(divide = 'ignore', invalid = 'ignore'):
+
+            media_x = np.bincount(codigos, x, minlength = k) / n
+            media_y = np.bincount(codigos, y, minlength = k) / n
+
+            # Sumas centradas, numéricamente más estables que las sumas crudas
+            dx = x - media_x[codigos]
+            dy = y - media_y[codigos]
+
+            sxx = np.bincount(codigos, dx * dx, minlength = k)
+            sxy = np.bincount(codigos, dx * dy, minlength = k)
+            syy = np.bincount(codigos, dy * dy, minlength = k)
+
+            pendiente = sxy / sxx
+            intercepto = media_y - pendiente * media_x
+            r2 = sxy ** 2 / (sxx * syy)
+
+        orden = np.lexsort((x, codigos))
+
+        primeros = np.searchsorted(codigos[orden], np.arange(k), side = 'left')
+        ultimos = np.searchsorted(codigos[orden], np.arange(k), side = 'right') - 1
+
+        rectas = []
+
+        for i in range(k):
+
+            if n[i] < 2 or not sxx[i] > 0:
+
+                rectas.append(None)
+
+                continue
+
+            extremos = x[orden][[primeros[i], ultimos[i]]]
+
+            rectas.append((pendiente[i], intercepto[i], r2[i], eje_x(extremos),
+                           intercepto[i] + pendiente[i] * extremos))
+
+        return rectas
+
+    # Convertir una columna en categórica
+    def __categorizar(self, df, columna, nombres = False):
+
+        """
+        Convierte una sola vez 'columna' en una columna categórica de pandas, 
+        con las categorías en orden de aparición. Los nombres se aplican como 
+        un cambio de nombre de las categorías, de modo que renombrar cuesta lo 
+        mismo que el número de categorías y no se reescriben las filas.
+
+        Parameters:
+        -----------
+        df: pandas.DataFrame
+            DataFrame registrado por el gráfico.
+
+        columna: str
+                 Nombre de la columna que se convertirá.
+
+        nombres: list, opcional
+                 Nuevos nombres de las categorías, en orden de aparición. Si no 
+                 se proporciona, se conservan los valores originales. Por 
+                 defecto es False.
+
+        Returns:
+        --------
+            pandas.DataFrame: DataFrame con 'columna' convertida. Las demás 
+            columnas se comparten con el DataFrame original.
+        """
+
+        serie = df[columna]
+
+        categorias = list(serie.dropna().unique())
+
+        categorica = pd.Categorical(serie, categories = categorias)
+
+        if nombres:
+
+            categorica = categorica.rename_categories(dict(zip(categorias, nombres)))
+
+        return df.assign(**{columna: categorica})
+
+    # Resumir los datos de un gráfico de barras
+    def __resumir_barras(self, df, variable_x, variable_y = False,
+                         variable_agrupar = False):
+
+        """
+        Calcula una sola vez los conteos y las sumas de cada celda (categoría
+        de 'variable_x', categoría de 'variable_agrupar') para que los gráficos
+        de barras envíen un valor por barra y no una fila por observación.
+
+        Parameters:
+        -----------
+        df: pandas.DataFrame
+            DataFrame que contiene los datos para el gráfico.
+
+        variable_x: str
+                    Nombre de la columna que se utilizará en el eje x.
+
+        variable_y: str, opcional
+                    Nombre de la columna que se sumará en cada celda. Por
+                    defecto es False.
+
+        variable_agrupar: str, opcional
+                          Nombre de la columna que se utilizará para agrupar
+                          las barras. Por defecto es False.
+
+        Returns:
+        --------
+            tuple: DataFrame con la columna 'count' y DataFrame con la suma de
+            'variable_y' (None si no se proporciona 'variable_y').
         """
-        
-        self.__app = nueva_app
-        
-        if self.__app.layout is None:
-        
-            self.__app.layout = html.Div([
-                
-                html.H1('Aplicación Dash'),
-                
-                html.A('Ver HTML', href='/html', target = '_blank'),
-                
-                html.Div(id = 'contenido_graficos')
-                
-                ])
 
-    # str
-    def __str__(self):
-        
-        '''
-        Devuelve una representación legible en forma de cadena de la
-        instancia de la clase
-               
-        Returns
-        -------
-            str: Texto que describe los atributos de la instancia.
-        '''
-        
-        return 'App actual: Aplicación Dash'
-    
+        columnas = [variable_x, variable_agrupar] if variable_agrupar else [variable_x]
+
+        agrupado = df.groupby(columnas, sort = False, observed = True)
+
+        conteos = agrupado.size().rename('count').reset_index()
+
+        sumas = agrupado[variable_y].sum().reset_index() if variable_y else None
+
+        return conteos, sumas
+
     # Crear un gráfico de barras
     def barras(self, df, variable_x, variable_y = False, 
-               nombres_categorias = False, nombres_ejes = False):
+               nombres_categorias = False, nombres_ejes = False, segundo_plano = False):
         
         """
         Método que crea un gráfico de barras agrupadas interactivo en la app 
@@ -166,6 +2539,13 @@ class GenerarGraficos:
                       Si no se proporciona, se utilizarán los nombres de las variables originales. 
                       Por defecto es False.
                       
+        segundo_plano: bool, opcional
+                       Si es True, la figura se construye en un callback en 
+                       segundo plano de Dash, fuera de los hilos del servidor, 
+                       con un aviso mientras se calcula y la opción de 
+                       cancelarlo. Requiere el paquete 'diskcache'. Por defecto 
+                       es False.
+                       
         Returns:
         --------
         None: La función no retorna ningún valor. Agrega el gráfico de barras
@@ -174,9 +2554,16 @@ class GenerarGraficos:
         
         df = df.dropna(subset = [variable_x])
         
-        categorias = list(df[variable_x].unique())
+        # Los nombres de las categorías se aplican una sola vez sobre la 
+        # columna categórica, no sobre cada fila
+        df = self.__categorizar(df, variable_x, nombres_categorias)
+        
+        # Un valor por barra en lugar de una fila por observación
+        conteos, sumas = self.__resumir_barras(df, variable_x, variable_y)
     
-        self.__app.layout.children.append(
+        grafico = self.__nuevo_grafico('barras', segundo_plano)
+        
+        self.__agregar(grafico, 
             html.Div([
                 html.Div([
                     
@@ -200,7 +2587,8 @@ class GenerarGraficos:
                         
                         html.Label('Título del gráfico:'),
                         dcc.Input(type = 'text', id = 'titulo_barras', 
-                                  placeholder = 'Ingrese el título del gráfico', 
+                                  placeholder = 'Ingrese el título del gráfico',
+                                  debounce = self.__modo_cliente,
                                   style = {'width': '100%'})], 
                         
                         style = {'display': 'inline-block', 'width': '20%', 'padding': '0 1%'}),
@@ -220,24 +2608,19 @@ class GenerarGraficos:
             ])
         )
     
-        @self.__app.callback(
+        @self.__callback(
     
+            grafico,
             Output('grafico_barras', 'figure'),
-            Input('color_barras', 'value'),
-            Input('tema_barras', 'value'),
-            Input('titulo_barras', 'value'),
-            Input('checklist_barras', 'value')
+            Input('checklist_barras', 'value'),
+            cosmeticos = [Input('tema_barras', 'value'), 
+                          Input('titulo_barras', 'value'),
+                          Input('color_barras', 'value')],
+            titulo = 'Gráfico de barras',
+            propiedades = [(['data', 0, 'marker', 'color'], None)]
     
         )
-        def grafico_barras(color, tema, titulo, frecuencia):
-    
-            if not nombres_categorias:
-                
-                nombres = categorias
-                
-            else:
-                
-                nombres = dict(zip(categorias, nombres_categorias))
+        def grafico_barras(frecuencia, tema, titulo, color):
     
             if not nombres_ejes:
                 
@@ -265,13 +2648,11 @@ class GenerarGraficos:
                 
             if frecuencia or not variable_y:
                 
-                fig = px.bar(df.replace({variable_x: nombres}),
-                             x = variable_x)
+                fig = px.bar(conteos, x = variable_x, y = 'count')
                 
             else:
     
-                fig = px.bar(df.replace({variable_x: nombres}),
-                             x = variable_x, y = variable_y)
+                fig = px.bar(sumas, x = variable_x, y = variable_y)
     
             fig.update_layout(
     
@@ -289,7 +2670,7 @@ class GenerarGraficos:
     # Crear un gráfico de barras agrupadas
     def barras_agrupadas(self, df, variable_x, variable_y = False, variable_agrupar = False, 
                          nombres_categorias = False, nombres_ejes = False, 
-                         nombres_leyendas = False):
+                         nombres_leyendas = False, segundo_plano = False):
         
         """
         Método que crea un gráfico de barras agrupadas interactivo en la app 
@@ -330,6 +2711,13 @@ class GenerarGraficos:
                           las categorías. Si no se proporciona, se utilizará el nombre 
                           de 'variable_agrupar'. Por defecto es False.
                           
+        segundo_plano: bool, opcional
+                       Si es True, la figura se construye en un callback en 
+                       segundo plano de Dash, fuera de los hilos del servidor, 
+                       con un aviso mientras se calcula y la opción de 
+                       cancelarlo. Requiere el paquete 'diskcache'. Por defecto 
+                       es False.
+                       
         Returns:
         --------
         None: La función no retorna ningún valor. Agrega el gráfico de barras agrupadas
@@ -338,9 +2726,19 @@ class GenerarGraficos:
        
         df = df.dropna(subset = [variable_agrupar])
         
-        categorias = list(df[variable_x].unique())
+        # Los nombres de las categorías y de las leyendas se aplican una sola 
+        # vez sobre las columnas categóricas, no sobre cada fila
+        df = self.__categorizar(df, variable_x, nombres_categorias)
+        
+        df = self.__categorizar(df, variable_agrupar, nombres_leyendas and nombres_leyendas[1:])
+        
+        # Un valor por celda (categoría, grupo) en lugar de una fila por observación
+        conteos, sumas = self.__resumir_barras(df, variable_x, variable_y, 
+                                               variable_agrupar)
         
-        self.__app.layout.children.append(
+        grafico = self.__nuevo_grafico('barras_agrupadas', segundo_plano)
+        
+        self.__agregar(grafico, 
             html.Div([
                 html.Div([
                     
@@ -357,6 +2755,7 @@ class GenerarGraficos:
                         html.Label('Título del gráfico:'),
                         dcc.Input(type = 'text', id = 'titulo_barras_agrupadas', 
                                   placeholder = 'Ingrese el título del gráfico',
+                                  debounce = self.__modo_cliente,
                                   style = {'width': '100%'})], 
                      
                         style = {'display': 'inline-block', 'width': '28%', 'padding': '0 1%'}),
@@ -377,24 +2776,18 @@ class GenerarGraficos:
             ])
         )
         
-        @self.__app.callback(
+        @self.__callback(
             
+            grafico,
             Output('grafico_barras_agrupadas', 'figure'),
-            Input('tema_barras_agrupadas', 'value'),
-            Input('titulo_barras_agrupadas', 'value'),
-            Input('checklist_barras_agrupadas', 'value')
+            Input('checklist_barras_agrupadas', 'value'),
+            cosmeticos = [Input('tema_barras_agrupadas', 'value'), 
+                          Input('titulo_barras_agrupadas', 'value')],
+            titulo = 'Gráfico de barras agrupadas'
             
         )
-        def grafico_barras_agrupadas(tema, titulo, frecuencia):
+        def grafico_barras_agrupadas(frecuencia, tema, titulo):
             
-            if not nombres_categorias:
-                
-                nombres = categorias
-                
-            else:
-                
-                nombres = dict(zip(categorias, nombres_categorias))
-                
             if not nombres_ejes:
                 
                 nombre_x = variable_x
@@ -421,15 +2814,15 @@ class GenerarGraficos:
                 
             if frecuencia or not variable_y:
                 
-                fig = px.bar(df.replace({variable_x: nombres}), 
-                             x = variable_x, color = variable_agrupar,
+                fig = px.bar(conteos, x = variable_x, y = 'count', 
+                             color = variable_agrupar,
                              title = titulo if titulo else 'Gráfico de barras agrupadas',
                              barmode = 'group')
                 
             else:
                 
-                fig = px.bar(df.replace({variable_x: nombres}), 
-                             x = variable_x, y = variable_y, color = variable_agrupar,
+                fig = px.bar(sumas, x = variable_x, y = variable_y, 
+                             color = variable_agrupar,
                              title = titulo if titulo else 'Gráfico de barras agrupadas',
                              barmode = 'group')
             
@@ -437,13 +2830,6 @@ class GenerarGraficos:
                 
                 titulo_leyenda = nombres_leyendas[0]
                 
-                categorias_leyendas = df[variable_agrupar].unique()
-                
-                labels_leyendas = dict(zip(categorias_leyendas, nombres_leyendas[1:]))
-            
-                fig.for_each_trace(lambda t: t.update
-                               (name = labels_leyendas[t.name]))
-                
             else:
                 
                 titulo_leyenda = variable_agrupar
@@ -462,7 +2848,7 @@ class GenerarGraficos:
     # Crear un gráfico de barras apiladas
     def barras_apiladas(self, df, variable_x, variable_y = False, variable_agrupar = False,
                         nombres_categorias = False, nombres_ejes = False, 
-                        nombres_leyendas = False):
+                        nombres_leyendas = False, segundo_plano = False):
         
         """
         Método que crea un gráfico de barras apiladas interactivo en la app actual 
@@ -503,6 +2889,13 @@ class GenerarGraficos:
                           las categorías. Si no se proporciona, se utilizará el nombre 
                           de 'variable_agrupar'. Por defecto es False.
                           
+        segundo_plano: bool, opcional
+                       Si es True, la figura se construye en un callback en 
+                       segundo plano de Dash, fuera de los hilos del servidor, 
+                       con un aviso mientras se calcula y la opción de 
+                       cancelarlo. Requiere el paquete 'diskcache'. Por defecto 
+                       es False.
+                       
         Returns:
         --------
         None: La función no retorna ningún valor. Agrega el gráfico de barras apiladas
@@ -511,9 +2904,19 @@ class GenerarGraficos:
         
         df = df.dropna(subset = [variable_agrupar])
         
-        categorias = list(df[variable_x].unique())
+        # Los nombres de las categorías y de las leyendas se aplican una sola 
+        # vez sobre las columnas categóricas, no sobre cada fila
+        df = self.__categorizar(df, variable_x, nombres_categorias)
+        
+        df = self.__categorizar(df, variable_agrupar, nombres_leyendas and nombres_leyendas[1:])
+        
+        # Un valor por celda (categoría, grupo) en lugar de una fila por observación
+        conteos, sumas = self.__resumir_barras(df, variable_x, variable_y, 
+                                               variable_agrupar)
         
-        self.__app.layout.children.append(
+        grafico = self.__nuevo_grafico('barras_apiladas', segundo_plano)
+        
+        self.__agregar(grafico, 
             html.Div([
                 html.Div([
                     
@@ -530,6 +2933,7 @@ class GenerarGraficos:
                         html.Label('Título del gráfico:'),
                         dcc.Input(type = 'text', id = 'titulo_barras_apiladas', 
                                   placeholder = 'Ingrese el título del gráfico',
+                                  debounce = self.__modo_cliente,
                                   style = {'width': '100%'})], 
                      
                         style = {'display': 'inline-block', 'width': '28%', 'padding': '0 1%'}),
@@ -550,24 +2954,18 @@ class GenerarGraficos:
             ])
         )
         
-        @self.__app.callback(
+        @self.__callback(
             
+            grafico,
             Output('grafico_barras_apiladas', 'figure'),
-            Input('tema_barras_apiladas', 'value'),
-            Input('titulo_barras_apiladas', 'value'),
             Input('checklist_barras_apiladas', 'value'),
+            cosmeticos = [Input('tema_barras_apiladas', 'value'), 
+                          Input('titulo_barras_apiladas', 'value')],
+            titulo = 'Gráfico de barras apiladas'
             
         )
-        def grafico_barras_apiladas(tema, titulo, frecuencia):
+        def grafico_barras_apiladas(frecuencia, tema, titulo):
             
-            if not nombres_categorias:
-                
-                nombres = categorias
-                
-            else:
-                
-                nombres = dict(zip(categorias, nombres_categorias))
-                
             if not nombres_ejes:
                 
                 nombre_x = variable_x
@@ -595,15 +2993,15 @@ class GenerarGraficos:
                 
             if frecuencia or not variable_y:
                 
-                fig = px.bar(df.replace({variable_x: nombres}), 
-                             x = variable_x, color = variable_agrupar,
+                fig = px.bar(conteos, x = variable_x, y = 'count', 
+                             color = variable_agrupar,
                              title = titulo if titulo else 'Gráfico de barras apiladas',
                              barmode = 'stack')
                 
             else:
 
-                fig = px.bar(df.replace({variable_x: nombres}), 
-                             x = variable_x, y = variable_y, color = variable_agrupar,
+                fig = px.bar(sumas, x = variable_x, y = variable_y, 
+                             color = variable_agrupar,
                              title = titulo if titulo else 'Gráfico de barras apiladas',
                              barmode = 'stack')
             
@@ -611,13 +3009,6 @@ class GenerarGraficos:
                 
                 titulo_leyenda = nombres_leyendas[0]
                 
-                categorias_leyendas = df[variable_agrupar].unique()
-                
-                labels_leyendas = dict(zip(categorias_leyendas, nombres_leyendas[1:]))
-            
-                fig.for_each_trace(lambda t: t.update
-                               (name = labels_leyendas[t.name]))
-                
             else:
                 
                 titulo_leyenda = variable_agrupar
@@ -635,7 +3026,8 @@ class GenerarGraficos:
         
     # Crear un histograma
     def histograma(self, df, variable_x, variable_y = False, variable_agrupar = False,
-                   nombres_categorias = False, nombres_ejes = False):
+                   nombres_categorias = False, nombres_ejes = False,
+                   segundo_plano = False):
         
         """
         Método que crea un histograma interactivo en la app actual usando el 
@@ -669,6 +3061,13 @@ class GenerarGraficos:
                       Si no se proporciona, se utilizarán los nombres de las variables originales. 
                       Por defecto es False.
                       
+        segundo_plano: bool, opcional
+                       Si es True, la figura se construye en un callback en 
+                       segundo plano de Dash, fuera de los hilos del servidor, 
+                       con un aviso mientras se calcula y la opción de 
+                       cancelarlo. Requiere el paquete 'diskcache'. Por defecto 
+                       es False.
+                       
         Returns:
         --------
         None: La función no retorna ningún valor. Agrega el histograma al layout 
@@ -691,7 +3090,33 @@ class GenerarGraficos:
     
                 nombres.append({'label': nombre, 'value': categoria})
         
-        self.__app.layout.children.append(
+        # Un eje x de texto o categórico tiene una barra por categoría, como en 
+        # plotly; los números y las fechas se agrupan en bins
+        x_fechas = self.__fechas(df[variable_x]) is not None
+        
+        x_numerico = x_fechas or pd.api.types.is_numeric_dtype(df[variable_x])
+        
+        # Valores ordenados de cada categoría, para volver a calcular los bins 
+        # con búsquedas binarias cada vez que cambia su número
+        indice = self.__indice_grupos(df, variable_agrupar)
+        
+        ordenados = {}
+        
+        for categoria in categorias:
+            
+            if x_numerico:
+            
+                ordenados[categoria] = self.__ordenar(df.take(indice[categoria]), 
+                                                      variable_x, variable_y)
+                
+            else:
+                
+                ordenados[categoria] = self.__contar_categorias(df.take(indice[categoria]), 
+                                                                variable_x, variable_y)
+        
+        grafico = self.__nuevo_grafico('histograma', segundo_plano)
+        
+        self.__agregar(grafico, 
             html.Div([
                 html.Div([
                     
@@ -724,6 +3149,7 @@ class GenerarGraficos:
                         html.Label('Título del gráfico:'),
                         dcc.Input(type = 'text', id = 'titulo_histograma', 
                                   placeholder = 'Ingrese el título del gráfico',
+                                  debounce = self.__modo_cliente,
                                   style = {'width': '100%'})], 
                      
                         style = {'display': 'inline-block', 'width': '18%', 'padding': '0 1%'}),
@@ -753,31 +3179,62 @@ class GenerarGraficos:
             ])
         )
         
-        @self.__app.callback(
+        @self.__callback(
             
+            grafico,
             Output('histograma', 'figure'),
             Input('categorias_histograma', 'value'),
-            Input('color_histograma', 'value'),
-            Input('tema_histograma', 'value'),
-            Input('titulo_histograma', 'value'),
             Input('checklist_histograma', 'value'),
-            Input('numero_bins', 'value')
+            Input('numero_bins', 'value'),
+            cosmeticos = [Input('tema_histograma', 'value'), 
+                          Input('titulo_histograma', 'value'),
+                          Input('color_histograma', 'value')],
+            titulo = 'Histograma',
+            propiedades = [(['data', 0, 'marker', 'color'], None)]
             
         )
-        def grafico_histograma(categoria, color, tema, titulo, frecuencia, bins):
-            
-            df_filtrado = df[df[variable_agrupar] == categoria]
+        def grafico_histograma(categoria, frecuencia, bins, tema, titulo, color):
             
             if frecuencia or not variable_y:
                 
-                fig = px.histogram(df_filtrado, x = variable_x, nbins = bins,
-                                   title = titulo if titulo else 'Histograma')
+                funcion = 'count'
                 
             else:
-
-                fig = px.histogram(df_filtrado, x = variable_x, y = variable_y,
-                                   title = titulo if titulo else 'Histograma',
-                                   nbins = bins)
+                
+                funcion = 'sum of ' + variable_y
+                
+            if not x_numerico:
+                
+                etiquetas, conteos, sumas = ordenados.get(categoria, ([], np.zeros(0), np.zeros(0)))
+                
+                fig = go.Figure(go.Bar(
+                    
+                    x = etiquetas, y = conteos if funcion == 'count' else sumas,
+                    hovertemplate = variable_x + '=%{x}<br>' + funcion + '=%{y}<extra></extra>'
+                    
+                    ))
+                
+            else:
+            
+                x, acumulado, eje_x = ordenados.get(categoria, (np.empty(0), np.zeros(1), 
+                                                                lambda valores: valores))
+                
+                bordes, alturas = self.__histograma(x, bins, None if funcion == 'count' else acumulado)
+                
+                # Las fechas se muestran como texto y los números con 4 cifras
+                formato = '' if x_fechas else ':.4g'
+                
+                # Solo se envía una barra por bin, sin importar el número de filas
+                fig = go.Figure(go.Bar(
+                    
+                    x = eje_x((bordes[:-1] + bordes[1:]) / 2), y = alturas,
+                    customdata = np.column_stack([eje_x(bordes[:-1]), eje_x(bordes[1:])]),
+                    hovertemplate = (variable_x + '=%{customdata[0]' + formato + '} - %{customdata[1]' + 
+                                     formato + '}<br>' + funcion + '=%{y}<extra></extra>')
+                    
+                    ))
+            
+            fig.update_layout(title = titulo if titulo else 'Histograma')
             
             if not nombres_ejes:
                 
@@ -820,7 +3277,8 @@ class GenerarGraficos:
     # Crear un gráfico de dispersión
     def dispersion(self, df, variable_x, variable_y, variable_agrupar = False,
                    nombres_ejes = False, nombres_leyendas = False, 
-                   nombres_cols = False):
+                   nombres_cols = False, webgl = None, rasterizar = False,
+                   resolucion = (480, 270), segundo_plano = False):
         
         """
         Método que crea un gráfico de dispersión interactivo en la app actual 
@@ -861,6 +3319,34 @@ class GenerarGraficos:
                       Si no se proporciona, se utilizarán los nombres originales 
                       de las columnas numéricas. Por defecto es False.
                       
+        webgl: bool, opcional
+               Si es True, los puntos siempre se dibujan con WebGL (scattergl); 
+               si es False, siempre con SVG. Si no se proporciona, se usa WebGL 
+               cuando el número de filas supera el umbral de la instancia. Por 
+               defecto es None.
+               
+        rasterizar: bool, opcional
+                    Si es True, los puntos se agrupan en el servidor en una 
+                    imagen de densidad con la resolución dada, coloreada por el 
+                    número de puntos o por el promedio de la columna elegida en 
+                    'Agrupar por'. La imagen se envía como PNG y se vuelve a 
+                    calcular para el rango visible cada vez que se hace zoom. 
+                    El valor de cada celda se lee en la barra de colores, no al 
+                    pasar el cursor. Los controles de tamaño, 
+                    regresión y categorización no aplican en este modo. Por 
+                    defecto es False.
+                    
+        resolucion: tuple, opcional
+                    Número de celdas (ancho, alto) de la imagen rasterizada. Por 
+                    defecto es (480, 270).
+                      
+        segundo_plano: bool, opcional
+                       Si es True, la figura se construye en un callback en 
+                       segundo plano de Dash, fuera de los hilos del servidor, 
+                       con un aviso mientras se calcula y la opción de 
+                       cancelarlo. Requiere el paquete 'diskcache'. Por defecto 
+                       es False.
+                       
         Returns:
         --------
         None: La función no retorna ningún valor. Agrega el gráfico de dispersión 
@@ -870,8 +3356,27 @@ class GenerarGraficos:
         if variable_agrupar:
             
             df = df.dropna(subset = [variable_agrupar])
+            
+            # Los nombres de las leyendas se aplican una sola vez sobre una 
+            # copia categórica de la columna, que solo se usa para colorear los 
+            # puntos por grupo; los controles usan las columnas originales, en 
+            # las que una columna de agrupación numérica sigue siendo numérica
+            grupos = self.__categorizar(df, variable_agrupar, nombres_leyendas and nombres_leyendas[1:])
+            
+        else:
+            
+            grupos = df
         
         cols = df.select_dtypes(include = ['int', 'float']).columns.tolist()
+
+        # Columnas en las que se imputan los valores nulos
+        if not df[variable_x].dtype in ['category', 'object']:
+            
+            imputables = [variable_x, variable_y]
+            
+        else:
+            
+            imputables = [variable_y]
         
         if not nombres_cols:
             
@@ -884,8 +3389,26 @@ class GenerarGraficos:
             for nombre, columna in zip(nombres_cols, cols):
     
                 nombres.append({'label': nombre, 'value': columna})
+                
+        # Controles que no aplican a la imagen rasterizada
+        if rasterizar:
+            
+            oculto = {'display': 'none'}
+            
+        else:
+            
+            oculto = {}
+            
+        # Puntos numéricos por método de imputación y columna de color
+        puntos = {}
+        
+        # Rectas de regresión por método de imputación, agrupación y columna 
+        # de tamaño
+        rectas = {}
+        
+        grafico = self.__nuevo_grafico('dispersion_rasterizada' if rasterizar else 'dispersion', segundo_plano)
         
-        self.__app.layout.children.append(
+        self.__agregar(grafico, 
             html.Div([
                 html.Div([
                         
@@ -895,7 +3418,7 @@ class GenerarGraficos:
                         dcc.Dropdown(options = nombres, value = '', 
                                          id = 'tamanno_dispersion')],
                             
-                        style = {'display': 'inline-block', 'width': '22%', 'padding': '0 1%'}),
+                        style = {'display': 'inline-block', 'width': '22%', 'padding': '0 1%', **oculto}),
                     
                     html.Div([
                             
@@ -927,6 +3450,7 @@ class GenerarGraficos:
                         html.Label('Título del gráfico:'),
                         dcc.Input(type = 'text', id = 'titulo_dispersion', 
                                   placeholder = 'Ingrese el título del gráfico',
+                                  debounce = self.__modo_cliente,
                                   style = {'width': '100%'})], 
                      
                         style = {'display': 'inline-block', 'width': '25%', 'padding': '0 1%'}),
@@ -939,7 +3463,7 @@ class GenerarGraficos:
                                       value = [], inline = True, 
                                       id = 'checklist1_dispersion')], 
                         
-                        style = {'display': 'inline-block', 'width': '15%', 'padding': '0 1%'}),
+                        style = {'display': 'inline-block', 'width': '15%', 'padding': '0 1%', **oculto}),
                     
                     html.Div([
                         
@@ -949,7 +3473,7 @@ class GenerarGraficos:
                                       value = ['Categorizar'], inline = True, 
                                       id = 'checklist2_dispersion')], 
                         
-                        style = {'display': 'inline-block', 'width': '15%', 'padding': '0 1%'}),
+                        style = {'display': 'inline-block', 'width': '15%', 'padding': '0 1%', **oculto}),
                     
                 ], style = {'display': 'flex', 'flex-wrap': 'wrap', 'padding': '10px 0'}),
     
@@ -958,163 +3482,308 @@ class GenerarGraficos:
             ])
         )
         
-        @self.__app.callback(
-            
-            Output('dispersion', 'figure'),
-            Input('tamanno_dispersion', 'value'),
-            Input('cols_dispersion', 'value'),
-            Input('tema_dispersion', 'value'),
-            Input('imputar_nan_dispersion', 'value'),
-            Input('titulo_dispersion', 'value'),
-            Input('checklist1_dispersion', 'value'),
-            Input('checklist2_dispersion', 'value')
-            
-        )
-        def grafico_dispersion(categoria, columna, tema, metodo, titulo, regresion, categorizar):
+        if rasterizar:
             
-            copia_df = df.copy()
-            
-            if metodo:
+            @self.__callback(
                 
-                if not df[variable_x].dtype in ['category', 'object']:
+                grafico,
+                Output('dispersion', 'figure'),
+                Input('cols_dispersion', 'value'),
+                Input('imputar_nan_dispersion', 'value'),
+                Input('dispersion', 'relayoutData'),
+                cosmeticos = [Input('tema_dispersion', 'value'), 
+                              Input('titulo_dispersion', 'value')],
+                titulo = 'Gráfico de dispersión'
                 
-                    operaciones = {
-                        
-                        'mean': [copia_df[variable_x].mean(), 
-                                 copia_df[variable_y].mean()],
-                        
-                        'median': [copia_df[variable_x].median(), 
-                                   copia_df[variable_y].median()],
+            )
+            def grafico_dispersion_rasterizado(columna, metodo, relayout, tema, titulo):
+                
+                if (metodo, columna) not in puntos:
+                    
+                    copia_df = self.__imputar(df, [variable_x, variable_y, columna], 
+                                              metodo, imputables).dropna()
+                    
+                    x, eje_x = self.__numeros(copia_df[variable_x])
+                    y, eje_y = self.__numeros(copia_df[variable_y])
+                    
+                    pesos = copia_df[columna].to_numpy(dtype = float) if columna else None
+                    
+                    puntos[(metodo, columna)] = (x, eje_x, y, eje_y, pesos)
+                    
+                x, eje_x, y, eje_y, pesos = puntos[(metodo, columna)]
+                
+                # Solo se agrupan los puntos de la región visible, con una celda 
+                # por píxel aproximadamente
+                visible_x = self.__rango_visible(relayout, 'xaxis')
+                visible_y = self.__rango_visible(relayout, 'yaxis')
+                
+                rangos = [None if visible is None else tuple(self.__numeros(pd.Series(visible))[0])
+                          for visible in (visible_x, visible_y)]
+                
+                bordes_x, bordes_y, conteos = self.__histograma_2d(x, y, resolucion[0], 
+                                                                   resolucion[1], rangos)
+                
+                if columna:
+                    
+                    _, _, sumas = self.__histograma_2d(x, y, resolucion[0], resolucion[1], 
+                                                       rangos, pesos)
+                    
+                    z = np.where(conteos > 0, sumas / np.maximum(conteos, 1), np.nan)
+                    
+                    if nombres_cols:
                         
-                        'max': [copia_df[variable_x].max(), 
-                                 copia_df[variable_y].max()],
+                        titulo_columna = next(item['label'] for item in nombres if item['value'] == columna)
                         
-                        'min': [copia_df[variable_x].min(), 
-                                copia_df[variable_y].min()]
+                    else:
                         
-                    }
+                        titulo_columna = columna
                     
-                    copia_df[variable_x] = copia_df[variable_x].fillna(operaciones[metodo][0])
+                else:
                     
-                    copia_df[variable_y] = copia_df[variable_y].fillna(operaciones[metodo][1])
+                    # Las celdas sin puntos quedan transparentes
+                    z = np.where(conteos > 0, conteos, np.nan)
                     
-                else:
+                    titulo_columna = 'Conteo'
                     
-                    operaciones = {
+                if not nombres_ejes:
                         
-                        'mean': copia_df[variable_y].mean(),
-                        
-                        'median': copia_df[variable_y].median(),
-                        
-                        'max': copia_df[variable_y].max(),
+                    nombre_x = variable_x
+                    nombre_y = variable_y
                         
-                        'min': copia_df[variable_y].min()
+                else:
                         
-                    }
+                    nombre_x = nombres_ejes[0]
+                    nombre_y = nombres_ejes[1]
                     
-                    copia_df[variable_y] = copia_df[variable_y].fillna(operaciones[metodo])
-
-            if categoria:
+                # La escala no depende del tema: la imagen ya tiene los colores y 
+                # el callback cosmético solo cambia la plantilla del layout
+                escala = px.colors.sequential.Plasma
                 
-                tamanno = categoria
+                # La cuadrícula se envía como una imagen PNG, que pesa mucho 
+                # menos que el valor de cada celda en JSON
+                imagen, minimo, maximo = self.__imagen_png(z, escala)
                 
-                copia_df = copia_df.dropna(subset = [categoria])
-                
-            else:
+                # Centro de la primera celda y ancho de las celdas de cada eje; 
+                # en los ejes de fechas el ancho va en milisegundos
+                celdas = []
                 
-                tamanno = None
+                for eje, bordes in ((eje_x, bordes_x), (eje_y, bordes_y)):
+                    
+                    inicio = eje(np.array([(bordes[0] + bordes[1]) / 2]))[0]
+                    ancho = bordes[1] - bordes[0]
+                    
+                    if isinstance(inicio, pd.Timestamp):
+                        
+                        inicio, ancho = inicio.round('us'), ancho / 1e6
+                    
+                    celdas.append((inicio, ancho))
+                    
+                (inicio_x, ancho_x), (inicio_y, ancho_y) = celdas
                 
-            if regresion:
+                fig = go.Figure(go.Image(source = imagen, x0 = inicio_x, dx = ancho_x,
+                                         y0 = inicio_y, dy = ancho_y,
+                                         hovertemplate = nombre_x + '=%{x}<br>' + 
+                                                         nombre_y + '=%{y}<extra></extra>'))
                 
-                regression = 'ols'
+                # Traza vacía que solo muestra la barra de colores de la imagen
+                fig.add_trace(go.Scatter(x = [None], y = [None], mode = 'markers', 
+                                         showlegend = False, hoverinfo = 'skip',
+                                         marker = dict(color = [minimo], cmin = minimo, 
+                                                       cmax = maximo, colorscale = escala,
+                                                       showscale = True,
+                                                       colorbar = dict(title = titulo_columna))))
                 
-            else:
+                fig.update_layout(xaxis_title = nombre_x,
+                                  yaxis_title = nombre_y,
+                                  template = tema,
+                                  title = titulo if titulo else 'Gráfico de dispersión')
                 
-                regression = None
+                # Las imágenes invierten el eje y y fijan la proporción de los 
+                # ejes por defecto
+                fig.update_yaxes(autorange = True, scaleanchor = False)
                 
-            if columna:
+                for inicio, actualizar in ((inicio_x, fig.update_xaxes), (inicio_y, fig.update_yaxes)):
+                    
+                    if isinstance(inicio, pd.Timestamp):
+                        
+                        actualizar(type = 'date')
                 
-                if nombres_cols:
+                # Se conserva la región visible para que el zoom no se pierda
+                if visible_x:
                     
-                    titulo_columna = next(item['label'] for item in nombres if item['value'] == columna)
+                    fig.update_xaxes(range = visible_x)
                     
-                else:
+                if visible_y:
                     
-                    titulo_columna = columna
+                    fig.update_yaxes(range = visible_y)
+                
+                return fig
+            
+        else:
+            
+            @self.__callback(
+                
+                grafico,
+                Output('dispersion', 'figure'),
+                Input('tamanno_dispersion', 'value'),
+                Input('cols_dispersion', 'value'),
+                Input('imputar_nan_dispersion', 'value'),
+                Input('checklist1_dispersion', 'value'),
+                Input('checklist2_dispersion', 'value'),
+                cosmeticos = [Input('tema_dispersion', 'value'), 
+                              Input('titulo_dispersion', 'value')],
+                titulo = 'Gráfico de dispersión'
+                
+            )
+            def grafico_dispersion(categoria, columna, metodo, regresion, categorizar, tema, titulo):
+                
+                # Los puntos se colorean por grupo cuando se categoriza sin elegir 
+                # otra columna en 'Agrupar por'
+                datos = grupos if categorizar and not columna else df
+                
+                copia_df = self.__imputar(datos, [variable_x, variable_y, variable_agrupar, 
+                                                  categoria, columna], metodo, imputables)
+
+                if categoria:
                     
-                if not categorizar or not variable_agrupar:
+                    tamanno = categoria
                     
-                    fig = px.scatter(copia_df, x = variable_x, y = variable_y, template = tema,
-                                     color = px.Constant('All Points'), size = tamanno, 
-                                     trendline = regression,
-                                     title = titulo if titulo else 'Gráfico de dispersión')
+                    copia_df = copia_df.dropna(subset = [categoria])
                     
-                    fig.update_layout(showlegend = False)
+                    # Si el tamaño es la columna de agrupación, se usan sus 
+                    # valores numéricos y no la copia categórica; sus filas no 
+                    # tienen nulos, así que coinciden con las de 'copia_df'
+                    if datos is grupos and categoria == variable_agrupar:
                         
+                        tamanno = df[categoria].to_numpy()
+                    
                 else:
                     
-                    fig = px.scatter(copia_df, x = variable_x, y = variable_y, template = tema,
-                                 color = columna, size = tamanno, trendline = regression,
-                                 title = titulo if titulo else 'Gráfico de dispersión')
+                    tamanno = None
                     
-                    fig.update_layout(coloraxis_colorbar = dict(title = titulo_columna))
-                
-            else:
-                
-                if not categorizar or not variable_agrupar:
+                # Por encima del umbral los puntos se dibujan con WebGL, salvo que 
+                # el gráfico indique explícitamente el modo
+                if webgl is None:
                     
-                    fig = px.scatter(copia_df, x = variable_x, y = variable_y, template = tema,
-                                     color = px.Constant('All Points'), size = tamanno, 
-                                     trendline = regression,
-                                     title = titulo if titulo else 'Gráfico de dispersión')
+                    modo = 'webgl' if len(copia_df) > self.__umbral_webgl else 'svg'
                     
-                    fig.update_layout(showlegend = False)
+                else:
+                    
+                    modo = 'webgl' if webgl else 'svg'
                     
+                if columna:
                     
+                    if nombres_cols:
+                        
+                        titulo_columna = next(item['label'] for item in nombres if item['value'] == columna)
+                        
+                    else:
+                        
+                        titulo_columna = columna
+                        
+                    if not categorizar or not variable_agrupar:
+                        
+                        fig = px.scatter(copia_df, x = variable_x, y = variable_y,
+                                         color = px.Constant('All Points'), size = tamanno, 
+                                         render_mode = modo,
+                                         title = titulo if titulo else 'Gráfico de dispersión')
+                        
+                        fig.update_layout(showlegend = False)
+                            
+                    else:
+                        
+                        fig = px.scatter(copia_df, x = variable_x, y = variable_y,
+                                     color = columna, size = tamanno, 
+                                     render_mode = modo,
+                                     title = titulo if titulo else 'Gráfico de dispersión')
+                        
+                        fig.update_layout(coloraxis_colorbar = dict(title = titulo_columna))
                     
                 else:
-                
-                    fig = px.scatter(copia_df, x = variable_x, y = variable_y, template = tema,
-                                 color = variable_agrupar, size = tamanno, trendline = regression,
-                                 title = titulo if titulo else 'Gráfico de dispersión')
                     
-                    if not nombres_leyendas:
+                    if not categorizar or not variable_agrupar:
                         
-                        titulo_leyenda = variable_agrupar
+                        fig = px.scatter(copia_df, x = variable_x, y = variable_y,
+                                         color = px.Constant('All Points'), size = tamanno, 
+                                         render_mode = modo,
+                                         title = titulo if titulo else 'Gráfico de dispersión')
                         
-                    else:
+                        fig.update_layout(showlegend = False)
                         
-                        titulo_leyenda = nombres_leyendas[0]
-        
-                    fig.update_layout(legend_title_text = titulo_leyenda)
+                        
+                        
+                    else:
                     
-                    if nombres_leyendas:
+                        fig = px.scatter(copia_df, x = variable_x, y = variable_y,
+                                     color = variable_agrupar, size = tamanno, 
+                                     render_mode = modo,
+                                     title = titulo if titulo else 'Gráfico de dispersión')
+                        
+                        if not nombres_leyendas:
                             
-                        categorias_leyendas = df[variable_agrupar].unique()
+                            titulo_leyenda = variable_agrupar
                             
-                        labels_leyendas = dict(zip(categorias_leyendas, nombres_leyendas[1:]))
+                        else:
+                            
+                            titulo_leyenda = nombres_leyendas[0]
+            
+                        fig.update_layout(legend_title_text = titulo_leyenda)
+                    
+                if not nombres_ejes:
                         
-                        fig.for_each_trace(lambda t: t.update
-                                           (name = labels_leyendas[t.name]))
-                
-            if not nombres_ejes:
+                    nombre_x = variable_x
+                    nombre_y = variable_y
+                        
+                else:
+                        
+                    nombre_x = nombres_ejes[0]
+                    nombre_y = nombres_ejes[1]
                     
-                nombre_x = variable_x
-                nombre_y = variable_y
+                if regresion:
                     
-            else:
+                    # Una recta por cada trazo de puntos, en el mismo orden
+                    agrupar = variable_agrupar if categorizar and not columna else False
                     
-                nombre_x = nombres_ejes[0]
-                nombre_y = nombres_ejes[1]
+                    if (metodo, agrupar, categoria) not in rectas:
+                        
+                        rectas[(metodo, agrupar, categoria)] = self.__ajustar_rectas(
+                            copia_df, variable_x, variable_y, agrupar)
+                        
+                    for traza, recta in zip(list(fig.data), rectas[(metodo, agrupar, categoria)]):
+                        
+                        if recta is None:
+                            
+                            continue
+                        
+                        pendiente, intercepto, r2, extremos_x, extremos_y = recta
+                        
+                        texto = '<b>OLS trendline</b><br>%s = %g * %s + %g<br>R<sup>2</sup>=%f<br><br>' % (
+                            nombre_y, pendiente, nombre_x, intercepto, r2)
+                        
+                        if agrupar:
+                            
+                            texto += '%s=%s<br>' % (variable_agrupar, traza.name)
+                        
+                        fig.add_trace(go.Scatter(x = extremos_x, y = extremos_y, mode = 'lines',
+                                                 name = traza.name, legendgroup = traza.legendgroup,
+                                                 showlegend = False,
+                                                 line_color = traza.marker.color if isinstance(traza.marker.color, str) else None,
+                                                 hovertemplate = texto + nombre_x + '=%{x}<br>' + nombre_y + 
+                                                                 '=%{y} <b>(trend)</b><extra></extra>'))
+                    
+                # El tema solo se aplica al layout: los colores de los puntos 
+                # salen de la plantilla por defecto, igual que cuando el tema se 
+                # cambia con el callback cosmético
+                fig.update_layout(xaxis_title = nombre_x,
+                                  yaxis_title = nombre_y,
+                                  template = tema)
                 
-            fig.update_layout(xaxis_title = nombre_x,
-                              yaxis_title = nombre_y)
-            
-            return fig
+                return fig
 
     # Crear un gráfico de líneas
     def lineas(self, df, variable_x, variable_y, variable_agrupar,
-               nombres_ejes = False, nombres_leyendas = False):
+               nombres_ejes = False, nombres_leyendas = False,
+               max_puntos = 1000, segundo_plano = False):
         
         """
         Método que crea un gráfico de líneas interactivo en la app actual 
@@ -1149,6 +3818,21 @@ class GenerarGraficos:
                           las categorías. Si no se proporciona, se utilizará el nombre 
                           de 'variable_agrupar'. Por defecto es False.
                           
+        max_puntos: int, opcional
+                    Número máximo de puntos que se envían por serie. Las series 
+                    más largas se reducen con el algoritmo LTTB y se vuelven a 
+                    calcular para el rango visible al hacer zoom. Solo se 
+                    aplica si el eje x es numérico o de fechas; si es 0, o si el 
+                    eje x es de texto, se envían todas las filas. Por defecto es 
+                    1000.
+                          
+        segundo_plano: bool, opcional
+                       Si es True, la figura se construye en un callback en 
+                       segundo plano de Dash, fuera de los hilos del servidor, 
+                       con un aviso mientras se calcula y la opción de 
+                       cancelarlo. Requiere el paquete 'diskcache'. Por defecto 
+                       es False.
+                       
         Returns:
         --------
         None: La función no retorna ningún valor. Agrega el gráfico de líneas
@@ -1157,7 +3841,51 @@ class GenerarGraficos:
         
         df = df.dropna(subset = [variable_agrupar])
         
-        self.__app.layout.children.append(
+        # Los nombres de las leyendas se aplican una sola vez sobre la columna 
+        # categórica, no sobre cada fila
+        df = self.__categorizar(df, variable_agrupar, nombres_leyendas and nombres_leyendas[1:])
+
+        # Columnas en las que se imputan los valores nulos
+        if not df[variable_x].dtype in ['category', 'object']:
+            
+            imputables = [variable_x, variable_y]
+            
+        else:
+            
+            imputables = [variable_y]
+            
+        # Solo se reducen los puntos si el eje x es numérico o de fechas y 
+        # alguna serie supera el máximo; en ese caso el gráfico también escucha 
+        # el zoom del usuario
+        x_fechas = self.__fechas(df[variable_x]) is not None
+        
+        reducir = (bool(max_puntos) and 
+                   (x_fechas or pd.api.types.is_numeric_dtype(df[variable_x])) and 
+                   df.groupby(variable_agrupar, observed = True).size().max() > max_puntos)
+        
+        entradas = [Input('imputar_nan_lineas', 'value'), 
+                    Input('checklist_lineas', 'value')]
+        
+        if reducir:
+            
+            entradas.append(Input('lineas', 'relayoutData'))
+            
+        # Series ordenadas por método de imputación
+        series = {}
+        
+        # En los ejes de fechas, promedios por día, semana, mes y año de cada 
+        # método de imputación; los de los datos sin imputar se calculan aquí
+        fechas = reducir and x_fechas
+        
+        niveles = {}
+        
+        if fechas:
+            
+            niveles[''] = self.__niveles_fechas(df, variable_x, variable_y, variable_agrupar)
+        
+        grafico = self.__nuevo_grafico('lineas_reducidas' if reducir else 'lineas', segundo_plano)
+        
+        self.__agregar(grafico, 
             html.Div([
                 html.Div([
                     
@@ -1182,6 +3910,7 @@ class GenerarGraficos:
                         html.Label('Título del gráfico:'),
                         dcc.Input(type = 'text', id = 'titulo_lineas', 
                                   placeholder = 'Ingrese el título del gráfico',
+                                  debounce = self.__modo_cliente,
                                   style = {'width': '100%'})], 
                      
                         style = {'display': 'inline-block', 'width': '22%', 'padding': '0 1%'}),
@@ -1202,58 +3931,44 @@ class GenerarGraficos:
             ])
         )
         
-        @self.__app.callback(
+        @self.__callback(
             
+            grafico,
             Output('lineas', 'figure'),
-            Input('tema_lineas', 'value'),
-            Input('imputar_nan_lineas', 'value'),
-            Input('titulo_lineas', 'value'),
-            Input('checklist_lineas', 'value')
+            *entradas,
+            cosmeticos = [Input('tema_lineas', 'value'), 
+                          Input('titulo_lineas', 'value')],
+            titulo = 'Gráfico de líneas'
             
         )
-        def grafico_lineas(tema, metodo, titulo, marcadores):
+        def grafico_lineas(metodo, marcadores, *valores):
             
-            copia_df = df.copy()
+            # Con reducción de puntos, el primer valor adicional es el zoom
+            tema, titulo = valores[-2:]
             
-            if metodo:
-                
-                if not df[variable_x].dtype in ['category', 'object']:
+            if reducir:
                 
-                    operaciones = {
-                        
-                        'mean': [copia_df[variable_x].mean(), 
-                                 copia_df[variable_y].mean()],
-                        
-                        'median': [copia_df[variable_x].median(), 
-                                   copia_df[variable_y].median()],
-                        
-                        'max': [copia_df[variable_x].max(), 
-                                 copia_df[variable_y].max()],
-                        
-                        'min': [copia_df[variable_x].min(), 
-                                copia_df[variable_y].min()]
-                        
-                    }
-                    
-                    copia_df[variable_x] = copia_df[variable_x].fillna(operaciones[metodo][0])
+                if metodo not in series:
                     
-                    copia_df[variable_y] = copia_df[variable_y].fillna(operaciones[metodo][1])
+                    copia_df = self.__imputar(df, [variable_x, variable_y, variable_agrupar], 
+                                              metodo, imputables)
                     
-                else:
+                    series[metodo] = self.__preparar_series(copia_df, variable_x, variable_y, 
+                                                            variable_agrupar, max_puntos)
                     
-                    operaciones = {
-                        
-                        'mean': copia_df[variable_y].mean(),
-                        
-                        'median': copia_df[variable_y].median(),
-                        
-                        'max': copia_df[variable_y].max(),
+                    if fechas and metodo not in niveles:
                         
-                        'min': copia_df[variable_y].min()
-                        
-                    }
+                        niveles[metodo] = self.__niveles_fechas(copia_df, variable_x, variable_y, 
+                                                                variable_agrupar)
                     
-                    copia_df[variable_y] = copia_df[variable_y].fillna(operaciones[metodo])
+                copia_df = self.__reducir_series(series[metodo], variable_x, variable_y, 
+                                                 max_puntos, self.__rango_visible(valores[0], 'xaxis'),
+                                                 niveles.get(metodo))
+                
+            else:
+            
+                copia_df = self.__imputar(df, [variable_x, variable_y, variable_agrupar], 
+                                          metodo, imputables)
             
             if marcadores:
                 
@@ -1292,21 +4007,17 @@ class GenerarGraficos:
                               legend_title_text = titulo_leyenda,
                               template = tema)
             
-            if nombres_leyendas:
-                
-                categorias_leyendas = df[variable_agrupar].unique()
+            if reducir:
                 
-                labels_leyendas = dict(zip(categorias_leyendas, nombres_leyendas[1:]))
-            
-                fig.for_each_trace(lambda t: t.update
-                               (name = labels_leyendas[t.name]))
+                # Se conserva el zoom del usuario al recibir los nuevos puntos
+                fig.update_layout(uirevision = 'lineas')
             
             return fig
 
     # Crear un gráfico de cajas
     def cajas(self, df, variable_x, variable_y, variable_agrupar = False,
               nombres_categorias = False, nombres_ejes = False, 
-              nombres_leyendas = False):
+              nombres_leyendas = False, segundo_plano = False):
         
         """
         Método que crea un gráfico de cajas interactivo en la app actual 
@@ -1347,6 +4058,13 @@ class GenerarGraficos:
                           las categorías. Si no se proporciona, se utilizará el nombre 
                           de 'variable_agrupar'. Por defecto es False.
                           
+        segundo_plano: bool, opcional
+                       Si es True, la figura se construye en un callback en 
+                       segundo plano de Dash, fuera de los hilos del servidor, 
+                       con un aviso mientras se calcula y la opción de 
+                       cancelarlo. Requiere el paquete 'diskcache'. Por defecto 
+                       es False.
+                       
         Returns:
         --------
         None: La función no retorna ningún valor. Agrega el gráfico de cajas 
@@ -1361,13 +4079,35 @@ class GenerarGraficos:
         
         if not nombres_categorias:
             
-            nombres = categorias
+            etiquetas = {}
+            
+        else:
+            
+            etiquetas = dict(zip(categorias, nombres_categorias))
+            
+        if variable_agrupar and nombres_leyendas:
+            
+            leyendas = dict(zip(df[variable_agrupar].unique(), nombres_leyendas[1:]))
+            
+        else:
+            
+            leyendas = {}
+
+        # Columnas en las que se imputan los valores nulos
+        if not df[variable_x].dtype in ['category', 'object']:
+            
+            imputables = [variable_x, variable_y]
             
         else:
             
-            nombres = dict(zip(categorias, nombres_categorias))
+            imputables = [variable_y]
+            
+        # Estadísticas de las cajas por método de imputación y categorización
+        resumenes = {}
+        
+        grafico = self.__nuevo_grafico('cajas', segundo_plano)
         
-        self.__app.layout.children.append(
+        self.__agregar(grafico, 
             html.Div([
                 html.Div([
                     
@@ -1392,6 +4132,7 @@ class GenerarGraficos:
                         html.Label('Título del gráfico:'),
                         dcc.Input(type = 'text', id = 'titulo_cajas', 
                                   placeholder = 'Ingrese el título del gráfico',
+                                  debounce = self.__modo_cliente,
                                   style = {'width': '100%'})], 
                      
                         style = {'display': 'inline-block', 'width': '22%', 'padding': '0 1%'}),
@@ -1412,81 +4153,74 @@ class GenerarGraficos:
             ])
         )
         
-        @self.__app.callback(
+        @self.__callback(
             
+            grafico,
             Output('cajas', 'figure'),
-            Input('tema_cajas', 'value'),
             Input('imputar_nan_cajas', 'value'),
-            Input('titulo_cajas', 'value'),
-            Input('checklist_cajas', 'value')
+            Input('checklist_cajas', 'value'),
+            cosmeticos = [Input('tema_cajas', 'value'), 
+                          Input('titulo_cajas', 'value')],
+            titulo = 'Gráfico de cajas'
             
         )
-        def grafico_cajas(tema, metodo, titulo, categorizar):
+        def grafico_cajas(metodo, categorizar, tema, titulo):
             
-            copia_df = df.copy()
+            colorear = bool(categorizar and variable_agrupar)
             
-            if metodo:
-                
-                if not df[variable_x].dtype in ['category', 'object']:
+            if (metodo, colorear) not in resumenes:
+            
+                copia_df = self.__imputar(df, [variable_x, variable_y, variable_agrupar], 
+                                          metodo, imputables)
                 
-                    operaciones = {
-                        
-                        'mean': [copia_df[variable_x].mean(), 
-                                 copia_df[variable_y].mean()],
-                        
-                        'median': [copia_df[variable_x].median(), 
-                                   copia_df[variable_y].median()],
-                        
-                        'max': [copia_df[variable_x].max(), 
-                                 copia_df[variable_y].max()],
-                        
-                        'min': [copia_df[variable_x].min(), 
-                                copia_df[variable_y].min()]
-                        
-                    }
-                    
-                    copia_df[variable_x] = copia_df[variable_x].fillna(operaciones[metodo][0])
+                if colorear:
                     
-                    copia_df[variable_y] = copia_df[variable_y].fillna(operaciones[metodo][1])
+                    resumenes[(metodo, colorear)] = self.__resumir_cajas(
+                        copia_df, variable_y, [variable_agrupar, variable_x])
                     
                 else:
                     
-                    operaciones = {
-                        
-                        'mean': copia_df[variable_y].mean(),
-                        
-                        'median': copia_df[variable_y].median(),
-                        
-                        'max': copia_df[variable_y].max(),
-                        
-                        'min': copia_df[variable_y].min()
-                        
-                    }
+                    resumenes[(metodo, colorear)] = self.__resumir_cajas(
+                        copia_df, variable_y, [variable_x])
                     
-                    copia_df[variable_y] = copia_df[variable_y].fillna(operaciones[metodo])
+            # Una caja por trazo y color, con solo sus estadísticas y sus 
+            # valores atípicos
+            trazos = {}
                     
-            if not categorizar or not variable_agrupar:
+            for grupo, estadisticas in resumenes[(metodo, colorear)].items():
                 
-                fig = px.box(copia_df.replace({variable_x: nombres}), x = variable_x, 
-                             y = variable_y, template = tema, 
-                             title = titulo if titulo else 'Gráfico de cajas')
+                color, categoria = grupo if colorear else (None, grupo[0])
                 
-            else:
+                trazos.setdefault(color, []).append((etiquetas.get(categoria, categoria),) + estadisticas)
                 
-                fig = px.box(copia_df.replace({variable_x: nombres}), x = variable_x, 
-                             y = variable_y, color = variable_agrupar, template = tema, 
-                             title = titulo if titulo else 'Gráfico de cajas')
+            fig = go.Figure()
+            
+            for color, cajas in trazos.items():
                 
-                if nombres_leyendas:
+                x, q1, mediana, q3, inferior, superior, atipicos = zip(*cajas)
+                
+                if colorear:
                     
-                    titulo_leyenda = nombres_leyendas[0]
+                    nombre = str(leyendas.get(color, color))
                     
-                    categorias_leyendas = df[variable_agrupar].unique()
+                else:
                     
-                    labels_leyendas = dict(zip(categorias_leyendas, nombres_leyendas[1:]))
+                    nombre = ''
+                
+                fig.add_trace(go.Box(x = list(x), q1 = list(q1), median = list(mediana),
+                                     q3 = list(q3), lowerfence = list(inferior),
+                                     upperfence = list(superior), y = list(atipicos),
+                                     boxpoints = 'outliers', name = nombre,
+                                     legendgroup = nombre, showlegend = colorear))
                 
-                    fig.for_each_trace(lambda t: t.update
-                                   (name = labels_leyendas[t.name]))
+            fig.update_layout(boxmode = 'group', template = tema,
+                              title = titulo if titulo else 'Gráfico de cajas')
+                
+            if colorear:
+                
+                if nombres_leyendas:
+                    
+                    titulo_leyenda = nombres_leyendas[0]
                     
                 else:
                     
@@ -1512,7 +4246,7 @@ class GenerarGraficos:
     # Crear un gráfico de violines
     def violines(self, df, variable_x, variable_y, variable_agrupar = False,  
                  nombres_categorias = False, nombres_ejes = False, 
-                 nombres_leyendas = False):
+                 nombres_leyendas = False, segundo_plano = False):
         
         """
         Método que crea un gráfico de violines interactivo en la app actual 
@@ -1553,6 +4287,13 @@ class GenerarGraficos:
                           las categorías. Si no se proporciona, se utilizará el nombre 
                           de 'variable_agrupar'. Por defecto es False.
                           
+        segundo_plano: bool, opcional
+                       Si es True, la figura se construye en un callback en 
+                       segundo plano de Dash, fuera de los hilos del servidor, 
+                       con un aviso mientras se calcula y la opción de 
+                       cancelarlo. Requiere el paquete 'diskcache'. Por defecto 
+                       es False.
+                       
         Returns:
         --------
         None: La función no retorna ningún valor. Agrega el gráfico de violines
@@ -1565,7 +4306,39 @@ class GenerarGraficos:
         
         categorias = list(df[variable_x].unique())
         
-        self.__app.layout.children.append(
+        if not nombres_categorias:
+            
+            etiquetas = {}
+            
+        else:
+            
+            etiquetas = dict(zip(categorias, nombres_categorias))
+            
+        if variable_agrupar and nombres_leyendas:
+            
+            leyendas = dict(zip(df[variable_agrupar].unique(), nombres_leyendas[1:]))
+            
+        else:
+            
+            leyendas = {}
+
+        # Columnas en las que se imputan los valores nulos
+        if not df[variable_x].dtype in ['category', 'object']:
+            
+            imputables = [variable_x, variable_y]
+            
+        else:
+            
+            imputables = [variable_y]
+            
+        colores = px.colors.qualitative.Plotly
+            
+        # Violines por método de imputación y categorización
+        resumenes = {}
+        
+        grafico = self.__nuevo_grafico('violines', segundo_plano)
+        
+        self.__agregar(grafico, 
             html.Div([
                 html.Div([
                     
@@ -1590,6 +4363,7 @@ class GenerarGraficos:
                         html.Label('Título del gráfico:'),
                         dcc.Input(type = 'text', id = 'titulo_violines', 
                                   placeholder = 'Ingrese el título del gráfico',
+                                  debounce = self.__modo_cliente,
                                   style = {'width': '100%'})], 
                      
                         style = {'display': 'inline-block', 'width': '22%', 'padding': '0 1%'}),
@@ -1610,78 +4384,107 @@ class GenerarGraficos:
             ])
         )
         
-        @self.__app.callback(
+        @self.__callback(
             
+            grafico,
             Output('violines', 'figure'),
-            Input('tema_violines', 'value'),
             Input('imputar_nan_violines', 'value'),
-            Input('titulo_violines', 'value'),
-            Input('checklist_violines', 'value')
+            Input('checklist_violines', 'value'),
+            cosmeticos = [Input('tema_violines', 'value'), 
+                          Input('titulo_violines', 'value')],
+            titulo = 'Gráfico de violines'
             
         )
-        def grafico_violines(tema, metodo, titulo, categorizar):
+        def grafico_violines(metodo, categorizar, tema, titulo):
             
-            if not nombres_categorias:
-                
-                nombres = categorias
-                
-            else:
+            colorear = bool(categorizar and variable_agrupar)
+            
+            if (metodo, colorear) not in resumenes:
+            
+                copia_df = self.__imputar(df, [variable_x, variable_y, variable_agrupar], 
+                                          metodo, imputables)
                 
-                nombres = dict(zip(categorias, nombres_categorias))
+                if colorear:
+                    
+                    resumenes[(metodo, colorear)] = self.__resumir_violines(
+                        copia_df, variable_y, [variable_agrupar, variable_x])
+                    
+                else:
+                    
+                    resumenes[(metodo, colorear)] = self.__resumir_violines(
+                        copia_df, variable_y, [variable_x])
+                    
+            resumen = resumenes[(metodo, colorear)]
+            
+            # Cada categoría del eje x ocupa una posición entera y sus violines 
+            # se reparten el 80 % de ese espacio, uno por color
+            ejes = list(dict.fromkeys(grupo[-1] for grupo in resumen))
+            grupos_color = list(dict.fromkeys(grupo[0] for grupo in resumen)) if colorear else [None]
+            
+            espacio = 0.8 / len(grupos_color)
             
-            copia_df = df.copy()
+            fig = go.Figure()
             
-            if metodo:
+            for j, color in enumerate(grupos_color):
                 
-                if not df[variable_x].dtype in ['category', 'object']:
+                forma_x, forma_y = [], []
+                centros, cajas, puntos_x, puntos_y = [], [], [], []
                 
-                    operaciones = {
-                        
-                        'mean': [copia_df[variable_x].mean(), 
-                                 copia_df[variable_y].mean()],
-                        
-                        'median': [copia_df[variable_x].median(), 
-                                   copia_df[variable_y].median()],
-                        
-                        'max': [copia_df[variable_x].max(), 
-                                 copia_df[variable_y].max()],
-                        
-                        'min': [copia_df[variable_x].min(), 
-                                copia_df[variable_y].min()]
+                for i, categoria in enumerate(ejes):
+                    
+                    grupo = (color, categoria) if colorear else (categoria,)
+                    
+                    if grupo not in resumen:
                         
-                    }
+                        continue
                     
-                    copia_df[variable_x] = copia_df[variable_x].fillna(operaciones[metodo][0])
+                    curva_y, densidad, caja, muestra = resumen[grupo]
                     
-                    copia_df[variable_y] = copia_df[variable_y].fillna(operaciones[metodo][1])
+                    centro = i - 0.4 + (j + 0.5) * espacio
                     
-                else:
+                    mitad = densidad * espacio / 2
                     
-                    operaciones = {
-                        
-                        'mean': copia_df[variable_y].mean(),
-                        
-                        'median': copia_df[variable_y].median(),
-                        
-                        'max': copia_df[variable_y].max(),
-                        
-                        'min': copia_df[variable_y].min()
-                        
-                    }
+                    # Contorno cerrado del violín; None separa un violín del siguiente.
+                    # Las posiciones se redondean porque solo afectan el dibujo
+                    forma_x += list(np.round(np.concatenate([centro + mitad, centro - mitad[::-1]]), 4)) + [None]
+                    forma_y += list(curva_y) + list(curva_y[::-1]) + [None]
                     
-                    copia_df[variable_y] = copia_df[variable_y].fillna(operaciones[metodo])
-            
-            if not categorizar or not variable_agrupar:
+                    centros.append(centro)
+                    cajas.append(caja)
+                    
+                    puntos_x += list(np.round(centro + (np.arange(muestra.size) % 7 - 3) * espacio / 20, 4))
+                    puntos_y += list(muestra)
+                    
+                nombre = str(leyendas.get(color, color)) if colorear else ''
                 
-                fig = px.violin(copia_df.replace({variable_x: nombres}), x = variable_x, 
-                                y = variable_y, box = True, points = 'all', 
-                                title = titulo if titulo else 'Gráfico de violines')
+                color_trazo = colores[j % len(colores)]
                 
-            else:
+                q1, mediana, q3, inferior, superior, _ = zip(*cajas)
+                
+                fig.add_trace(go.Scatter(x = forma_x, y = forma_y, mode = 'lines', 
+                                         fill = 'toself', line_color = color_trazo, 
+                                         name = nombre, legendgroup = nombre, 
+                                         showlegend = colorear, hoverinfo = 'skip'))
+                
+                fig.add_trace(go.Box(x = centros, q1 = list(q1), median = list(mediana), 
+                                     q3 = list(q3), lowerfence = list(inferior), 
+                                     upperfence = list(superior), width = espacio / 4, 
+                                     boxpoints = False, marker_color = color_trazo, 
+                                     name = nombre, legendgroup = nombre, 
+                                     showlegend = False))
+                
+                fig.add_trace(go.Scatter(x = puntos_x, y = puntos_y, mode = 'markers', 
+                                         marker = dict(color = color_trazo, size = 3),
+                                         name = nombre, legendgroup = nombre, 
+                                         showlegend = False, hovertemplate = '%{y}'))
+                
+            fig.update_layout(template = tema, 
+                              title = titulo if titulo else 'Gráfico de violines',
+                              xaxis = dict(tickmode = 'array', 
+                                           tickvals = list(range(len(ejes))),
+                                           ticktext = [str(etiquetas.get(c, c)) for c in ejes]))
             
-                fig = px.violin(copia_df.replace({variable_x: nombres}), x = variable_x, 
-                                y = variable_y, color = variable_agrupar, box = True, 
-                                points = 'all', title = titulo if titulo else 'Gráfico de violines')
+            if colorear:
                 
                 if not nombres_leyendas:
                     
@@ -1690,15 +4493,8 @@ class GenerarGraficos:
                 else:
                     
                     titulo_leyenda = nombres_leyendas[0]
-                    
-                    categorias_leyendas = df[variable_agrupar].unique()
-                    
-                    labels_leyendas = dict(zip(categorias_leyendas, nombres_leyendas[1:]))
-                
-                    fig.for_each_trace(lambda t: t.update
-                                   (name = labels_leyendas[t.name]))
 
-                fig.update_layout(legend_title_text = titulo_leyenda, template = tema)
+                fig.update_layout(legend_title_text = titulo_leyenda)
             
             if not nombres_ejes:
                 
@@ -1717,7 +4513,8 @@ class GenerarGraficos:
 
     # Crear un gráfico de areas
     def areas(self, df, variable_x, variable_y, variable_agrupar,
-              nombres_ejes = False, nombres_leyendas = False):
+              nombres_ejes = False, nombres_leyendas = False,
+              max_puntos = 1000, segundo_plano = False):
         
         """
         Método que crea un gráfico de áreas interactivo en la app actual usando 
@@ -1752,6 +4549,21 @@ class GenerarGraficos:
                           las categorías. Si no se proporciona, se utilizará el nombre 
                           de 'variable_agrupar'. Por defecto es False.
                           
+        max_puntos: int, opcional
+                    Número máximo de puntos que se envían por serie. Las series 
+                    más largas se reducen con el algoritmo LTTB y se vuelven a 
+                    calcular para el rango visible al hacer zoom. Solo se 
+                    aplica si el eje x es numérico o de fechas; si es 0, o si el 
+                    eje x es de texto, se envían todas las filas. Por defecto es 
+                    1000.
+                          
+        segundo_plano: bool, opcional
+                       Si es True, la figura se construye en un callback en 
+                       segundo plano de Dash, fuera de los hilos del servidor, 
+                       con un aviso mientras se calcula y la opción de 
+                       cancelarlo. Requiere el paquete 'diskcache'. Por defecto 
+                       es False.
+                       
         Returns:
         --------
         None: La función no retorna ningún valor. Agrega el gráfico de areas
@@ -1760,7 +4572,50 @@ class GenerarGraficos:
         
         df = df.dropna(subset = [variable_agrupar])
         
-        self.__app.layout.children.append(
+        # Los nombres de las leyendas se aplican una sola vez sobre la columna 
+        # categórica, no sobre cada fila
+        df = self.__categorizar(df, variable_agrupar, nombres_leyendas and nombres_leyendas[1:])
+
+        # Columnas en las que se imputan los valores nulos
+        if not df[variable_x].dtype in ['category', 'object']:
+            
+            imputables = [variable_x, variable_y]
+            
+        else:
+            
+            imputables = [variable_y]
+            
+        # Solo se reducen los puntos si el eje x es numérico o de fechas y 
+        # alguna serie supera el máximo; en ese caso el gráfico también escucha 
+        # el zoom del usuario
+        x_fechas = self.__fechas(df[variable_x]) is not None
+        
+        reducir = (bool(max_puntos) and 
+                   (x_fechas or pd.api.types.is_numeric_dtype(df[variable_x])) and 
+                   df.groupby(variable_agrupar, observed = True).size().max() > max_puntos)
+        
+        entradas = [Input('imputar_nan_areas', 'value')]
+        
+        if reducir:
+            
+            entradas.append(Input('areas', 'relayoutData'))
+            
+        # Series ordenadas por método de imputación
+        series = {}
+        
+        # En los ejes de fechas, promedios por día, semana, mes y año de cada 
+        # método de imputación; los de los datos sin imputar se calculan aquí
+        fechas = reducir and x_fechas
+        
+        niveles = {}
+        
+        if fechas:
+            
+            niveles[''] = self.__niveles_fechas(df, variable_x, variable_y, variable_agrupar)
+        
+        grafico = self.__nuevo_grafico('areas_reducidas' if reducir else 'areas', segundo_plano)
+        
+        self.__agregar(grafico, 
             html.Div([
                 html.Div([
                     
@@ -1785,6 +4640,7 @@ class GenerarGraficos:
                         html.Label('Título del gráfico:'),
                         dcc.Input(type = 'text', id = 'titulo_areas', 
                                   placeholder = 'Ingrese el título del gráfico',
+                                  debounce = self.__modo_cliente,
                                   style = {'width': '100%'})], 
                      
                         style = {'display': 'inline-block', 'width': '28%', 'padding': '0 1%'}),
@@ -1796,57 +4652,44 @@ class GenerarGraficos:
             ])
         )
         
-        @self.__app.callback(
+        @self.__callback(
             
+            grafico,
             Output('areas', 'figure'),
-            Input('tema_areas', 'value'),
-            Input('imputar_nan_areas', 'value'),
-            Input('titulo_areas', 'value')
+            *entradas,
+            cosmeticos = [Input('tema_areas', 'value'), 
+                          Input('titulo_areas', 'value')],
+            titulo = 'Gráfico de áreas'
             
         )
-        def grafico_areas(tema, metodo, titulo):
+        def grafico_areas(metodo, *valores):
             
-            copia_df = df.copy()
+            # Con reducción de puntos, el primer valor adicional es el zoom
+            tema, titulo = valores[-2:]
             
-            if metodo:
+            if reducir:
                 
-                if not df[variable_x].dtype in ['category', 'object']:
-                
-                    operaciones = {
-                        
-                        'mean': [copia_df[variable_x].mean(), 
-                                 copia_df[variable_y].mean()],
-                        
-                        'median': [copia_df[variable_x].median(), 
-                                   copia_df[variable_y].median()],
-                        
-                        'max': [copia_df[variable_x].max(), 
-                                 copia_df[variable_y].max()],
-                        
-                        'min': [copia_df[variable_x].min(), 
-                                copia_df[variable_y].min()]
-                        
-                    }
+                if metodo not in series:
                     
-                    copia_df[variable_x] = copia_df[variable_x].fillna(operaciones[metodo][0])
+                    copia_df = self.__imputar(df, [variable_x, variable_y, variable_agrupar], 
+                                              metodo, imputables)
                     
-                    copia_df[variable_y] = copia_df[variable_y].fillna(operaciones[metodo][1])
+                    series[metodo] = self.__preparar_series(copia_df, variable_x, variable_y, 
+                                                            variable_agrupar, max_puntos)
                     
-                else:
-                    
-                    operaciones = {
-                        
-                        'mean': copia_df[variable_y].mean(),
-                        
-                        'median': copia_df[variable_y].median(),
+                    if fechas and metodo not in niveles:
                         
-                        'max': copia_df[variable_y].max(),
-                        
-                        'min': copia_df[variable_y].min()
-                        
-                    }
+                        niveles[metodo] = self.__niveles_fechas(copia_df, variable_x, variable_y, 
+                                                                variable_agrupar)
                     
-                    copia_df[variable_y] = copia_df[variable_y].fillna(operaciones[metodo])
+                copia_df = self.__reducir_series(series[metodo], variable_x, variable_y, 
+                                                 max_puntos, self.__rango_visible(valores[0], 'xaxis'),
+                                                 niveles.get(metodo))
+                
+            else:
+            
+                copia_df = self.__imputar(df, [variable_x, variable_y, variable_agrupar], 
+                                          metodo, imputables)
 
             fig = px.area(copia_df, x = variable_x, y = variable_y, 
                           color = variable_agrupar, line_group = variable_agrupar,
@@ -1869,23 +4712,26 @@ class GenerarGraficos:
             else:
                 
                 titulo_leyenda = nombres_leyendas[0]
-                
-                categorias_leyendas = df[variable_agrupar].unique()
-                
-                labels_leyendas = dict(zip(categorias_leyendas, nombres_leyendas[1:]))
-            
-                fig.for_each_trace(lambda t: t.update
-                               (name = labels_leyendas[t.name]))
 
             fig.update_layout(xaxis_title = nombre_x,
                               yaxis_title = nombre_y,
                               legend_title_text = titulo_leyenda,
                               template = tema)
             
+            if reducir:
+                
+                # Cada serie conserva puntos distintos, así que el apilado 
+                # interpola en lugar de insertar ceros
+                fig.update_traces(stackgaps = 'interpolate')
+                
+                # Se conserva el zoom del usuario al recibir los nuevos puntos
+                fig.update_layout(uirevision = 'areas')
+            
             return fig
 
     # Crear un gráfico de pastel
-    def pastel(self, df, variable_x, variable_y, nombres_leyendas = False):
+    def pastel(self, df, variable_x, variable_y, nombres_leyendas = False,
+               segundo_plano = False):
         
         """
         Método que crea un gráfico de pastel interactivo en la app actual usando
@@ -1908,6 +4754,13 @@ class GenerarGraficos:
                           Lista para mapear nombres personalizados a las leyendas 
                           de las categorías.
                           
+        segundo_plano: bool, opcional
+                       Si es True, la figura se construye en un callback en 
+                       segundo plano de Dash, fuera de los hilos del servidor, 
+                       con un aviso mientras se calcula y la opción de 
+                       cancelarlo. Requiere el paquete 'diskcache'. Por defecto 
+                       es False.
+                       
         Returns:
         --------
         None: La función no retorna ningún valor. Agrega el gráfico de pastel
@@ -1936,7 +4789,18 @@ class GenerarGraficos:
         
         df = df.dropna(subset = [variable_y])
         
-        self.__app.layout.children.append(
+        if nombres_leyendas:
+            
+            categorias_leyendas = df[variable_y].unique()
+            
+            labels_leyendas = dict(zip(categorias_leyendas, nombres_leyendas))
+            
+            # Los nombres de las leyendas se asignan una sola vez
+            df = df.assign(**{variable_y: df[variable_y].map(labels_leyendas)})
+        
+        grafico = self.__nuevo_grafico('pastel', segundo_plano)
+        
+        self.__agregar(grafico, 
             html.Div([
                 html.Div([
                     
@@ -1970,6 +4834,7 @@ class GenerarGraficos:
                         html.Label('Título del gráfico:'),
                         dcc.Input(type = 'text', id = 'titulo_pastel', 
                                   placeholder = 'Ingrese el título del gráfico',
+                                  debounce = self.__modo_cliente,
                                   style = {'width': '100%'})], 
                      
                         style = {'display': 'inline-block', 'width': '22%', 'padding': '0 1%'}),
@@ -1981,7 +4846,7 @@ class GenerarGraficos:
                         dcc.Slider(id = 'hueco_pastel', min = 0, max = 0.5, step = 0.1, 
                                    value = 0, 
                                    marks = {i: str(i) for i in 
-                                            [round(v, 1) for v in 
+                                            [round(float(v), 1) for v in 
                                              np.arange(0, 0.51, 0.1)]})],
                          
                          style = {'display': 'inline-block', 'width': '35%', 'padding': '0 1%'}),
@@ -1993,48 +4858,29 @@ class GenerarGraficos:
             ])
         )
         
-        @self.__app.callback(
+        @self.__callback(
             
+            grafico,
             Output('pastel', 'figure'),
-            Input('tema_pastel', 'value'),
             Input('imputar_nan_pastel', 'value'),
-            Input('titulo_pastel', 'value'),
-            Input('hueco_pastel', 'value'),
-            Input('colores_pastel', 'value')
+            cosmeticos = [Input('tema_pastel', 'value'), 
+                          Input('titulo_pastel', 'value'),
+                          Input('hueco_pastel', 'value'),
+                          Input('colores_pastel', 'value')],
+            titulo = 'Gráfico de pastel',
+            propiedades = [(['data', 0, 'hole'], None),
+                           (['layout', 'piecolorway'], colores)]
             
         )
-        def grafico_pastel(tema, metodo, titulo, hueco, color):
-            
-            copia_df = df.copy()
-            
-            if nombres_leyendas:
-                
-                categorias_leyendas = df[variable_y].unique()
-                
-                labels_leyendas = dict(zip(categorias_leyendas, nombres_leyendas))
-            
-                copia_df[variable_y] = copia_df[variable_y].map(labels_leyendas)
+        def grafico_pastel(metodo, tema, titulo, hueco, color):
             
-            if metodo:
-                
-                operaciones = {
-                    
-                    'mean': copia_df[variable_x].mean(),
-                    
-                    'median': copia_df[variable_x].median(),
-                    
-                    'max': copia_df[variable_x].max(),
-                    
-                    'min': copia_df[variable_x].min()
-                    
-                }
-                
-                copia_df[variable_x] = copia_df[variable_x].fillna(operaciones[metodo])
+            copia_df = self.__imputar(df, [variable_x, variable_y], metodo, [variable_x])
             
             fig = px.pie(copia_df, values = variable_x, names = variable_y,
                          title = titulo if titulo else 'Gráfico de pastel',
-                         template = tema, hole = hueco,
-                         color_discrete_sequence = colores[color])
+                         hole = hueco, color_discrete_sequence = colores[color])
+            
+            fig.update_layout(template = tema)
             
             fig.update_traces(marker = dict(line = dict(
                 color = '#000000', width = 0.5)))
@@ -2042,7 +4888,8 @@ class GenerarGraficos:
             return fig
 
     # Crear un gráfico de mapa de calor
-    def mapa_calor(self, df, variable_x, variable_y, nombres_ejes = False):
+    def mapa_calor(self, df, variable_x, variable_y, nombres_ejes = False,
+                   segundo_plano = False):
         
         """
         Método que crea un gráfico de mapa de calor interactivo en la app actual 
@@ -2063,6 +4910,13 @@ class GenerarGraficos:
                       Nombres personalizados para los ejes x e y. Si no se proporcionan, 
                       se utilizarán los nombres de las variables originales.
                       
+        segundo_plano: bool, opcional
+                       Si es True, la figura se construye en un callback en 
+                       segundo plano de Dash, fuera de los hilos del servidor, 
+                       con un aviso mientras se calcula y la opción de 
+                       cancelarlo. Requiere el paquete 'diskcache'. Por defecto 
+                       es False.
+                       
         Returns:
         --------
         None: La función no retorna ningún valor. Agrega el gráfico de mapa de calor
@@ -2077,9 +4931,33 @@ class GenerarGraficos:
             'YlGnBu', 'YlOrRd', 'Rainbow'
             
         ]
-
         
-        self.__app.layout.children.append(
+        escalas = {i: px.colors.get_colorscale(escala) for i, escala in enumerate(colores)}
+        
+        if not nombres_ejes:
+            
+            nombre_x = variable_x
+            nombre_y = variable_y
+            
+        else:
+            
+            nombre_x = nombres_ejes[0]
+            nombre_y = nombres_ejes[1]
+        
+        # Solo las filas con ambos valores entran en alguna celda
+        valores = df[[variable_x, variable_y]].dropna()
+        
+        # Los ejes categóricos tienen una celda por categoría
+        eje_x = self.__eje_conteos(valores[variable_x])
+        eje_y = self.__eje_conteos(valores[variable_y])
+        
+        # Conteos de las últimas combinaciones de bins usadas, del uso más 
+        # antiguo al más reciente
+        conteos = OrderedDict()
+        
+        grafico = self.__nuevo_grafico('mapa_calor', segundo_plano)
+        
+        self.__agregar(grafico, 
             html.Div([
                 html.Div([
                     
@@ -2096,6 +4974,7 @@ class GenerarGraficos:
                         html.Label('Título del gráfico:'),
                         dcc.Input(type = 'text', id = 'titulo_mapa_calor', 
                                   placeholder = 'Ingrese el título del gráfico',
+                                  debounce = self.__modo_cliente,
                                   style = {'width': '100%'})], 
                      
                         style = {'display': 'inline-block', 'width': '28%', 'padding': '0 1%'}),
@@ -2144,52 +5023,69 @@ class GenerarGraficos:
             ])
         )
         
-        @self.__app.callback(
+        @self.__callback(
             
+            grafico,
             Output('mapa_calor', 'figure'),
-            Input('tema_mapa_calor', 'value'),
-            Input('titulo_mapa_calor', 'value'),
-            Input('checklist_mapa_calor', 'value'),
-            Input('colores_heatmap', 'value'),
             Input('bins_x', 'value'),
             Input('bins_y', 'value'),
+            cosmeticos = [Input('tema_mapa_calor', 'value'), 
+                          Input('titulo_mapa_calor', 'value'),
+                          Input('checklist_mapa_calor', 'value'),
+                          Input('colores_heatmap', 'value')],
+            titulo = 'Mapa de calor',
+            propiedades = [(['data', 0, 'texttemplate'], {True: '%{z}', False: ''}),
+                           (['data', 0, 'colorscale'], escalas)]
             
         )
-        def grafico_mapa_calor(tema, titulo, numeros, color, bins_x, bins_y):
-                
-            if numeros:
+        def grafico_mapa_calor(bins_x, bins_y, tema, titulo, numeros, color):
+            
+            # Los valores llegan del navegador, así que se limitan al rango de 
+            # los sliders
+            try:
                 
-                text = True
+                bins_x, bins_y = [min(max(int(bins), 5), 50) for bins in (bins_x, bins_y)]
                 
-            else:
+            except (TypeError, ValueError):
                 
-                text = False
-
-            fig = px.density_heatmap(df, x = variable_x, y = variable_y, 
-                                     text_auto = text, nbinsx = bins_x, nbinsy = bins_y, 
-                                     color_continuous_scale = colores[color],
-                                     title = titulo if titulo else 'Mapa de calor')
+                raise PreventUpdate
             
-            if not nombres_ejes:
+            cuadricula = conteos.pop((bins_x, bins_y), None)
+            
+            if cuadricula is None:
                 
-                nombre_x = variable_x
-                nombre_y = variable_y
+                cuadricula = self.__conteos_2d(eje_x, eje_y, bins_x, bins_y)
                 
-            else:
+            conteos[(bins_x, bins_y)] = cuadricula
+            
+            # Como en la caché de figuras, se descartan las cuadrículas usadas 
+            # hace más tiempo
+            while len(conteos) > 32:
                 
-                nombre_x = nombres_ejes[0]
-                nombre_y = nombres_ejes[1]
+                conteos.popitem(last = False)
+                
+            celdas_x, celdas_y, z = cuadricula
+            
+            # Solo se envía una celda por combinación de bins, sin importar el 
+            # número de filas
+            fig = go.Figure(go.Heatmap(x = celdas_x, y = celdas_y,
+                                       z = z, colorscale = colores[color],
+                                       texttemplate = '%{z}' if numeros else '',
+                                       colorbar = dict(title = 'Conteo'),
+                                       hovertemplate = nombre_x + '=%{x}<br>' + 
+                                                       nombre_y + '=%{y}<br>' +
+                                                       'Conteo=%{z}<extra></extra>'))
 
             fig.update_layout(xaxis_title = nombre_x,
                               yaxis_title = nombre_y,
                               template = tema,
-                              coloraxis_colorbar = dict(
-                                  title = 'Conteo'))
+                              title = titulo if titulo else 'Mapa de calor')
             
             return fig
 
     # Crear un gráfico de curvas de densidad
-    def densidad(self, df, variable_x, variable_agrupar, nombres_leyendas = False):
+    def densidad(self, df, variable_x, variable_agrupar, nombres_leyendas = False,
+                 segundo_plano = False):
         
         """
         Método que crea un gráfico de mapa de densidad interactivo en la app actual 
@@ -2215,6 +5111,13 @@ class GenerarGraficos:
                           Si no se proporciona, se utilizan los valores únicos de 
                           'variable_agrupar'.
                           
+        segundo_plano: bool, opcional
+                       Si es True, la figura se construye en un callback en 
+                       segundo plano de Dash, fuera de los hilos del servidor, 
+                       con un aviso mientras se calcula y la opción de 
+                       cancelarlo. Requiere el paquete 'diskcache'. Por defecto 
+                       es False.
+                       
         Returns:
         --------
         None: La función no retorna ningún valor. Agrega el gráfico de densidad 
@@ -2225,7 +5128,25 @@ class GenerarGraficos:
         
         categorias = list(df[variable_agrupar].unique())
         
-        self.__app.layout.children.append(
+        # Filas de cada categoría, calculadas una sola vez
+        indice = self.__indice_grupos(df, variable_agrupar)
+        
+        if nombres_leyendas:
+            
+            nombres = nombres_leyendas[1:]
+            
+        else:
+            
+            nombres = categorias
+            
+        colores = px.colors.qualitative.D3
+        
+        # Curvas de cada categoría, por método de imputación y tipo de curva
+        curvas = {}
+        
+        grafico = self.__nuevo_grafico('densidad', segundo_plano)
+        
+        self.__agregar(grafico, 
             html.Div([
                 html.Div([
                     
@@ -2250,6 +5171,7 @@ class GenerarGraficos:
                         html.Label('Título del gráfico:'),
                         dcc.Input(type = 'text', id = 'titulo_densidad', 
                                   placeholder = 'Ingrese el título del gráfico',
+                                  debounce = self.__modo_cliente,
                                   style = {'width': '100%'})], 
                      
                         style = {'display': 'inline-block', 'width': '20%', 'padding': '0 1%'}),
@@ -2270,44 +5192,18 @@ class GenerarGraficos:
             ])
         )
         
-        @self.__app.callback(
+        @self.__callback(
             
+            grafico,
             Output('densidad', 'figure'),
-            Input('tema_densidad', 'value'),
             Input('imputar_nan_densidad', 'value'),
-            Input('titulo_densidad', 'value'),
-            Input('checklist_densidad', 'value')
+            Input('checklist_densidad', 'value'),
+            cosmeticos = [Input('tema_densidad', 'value'), 
+                          Input('titulo_densidad', 'value')],
+            titulo = 'Gráfico de densidad'
             
         )
-        def grafico_densidad(tema, metodo, titulo, tipo):
-            
-            copia_df = df.dropna(subset = [variable_x])
-            
-            if metodo:
-                
-                copia_df = df.copy()
-                
-                operaciones = {
-                        
-                    'mean': copia_df[variable_x].mean(),
-                        
-                    'median': copia_df[variable_x].median(),
-                        
-                    'max': copia_df[variable_x].max(),
-                        
-                    'min': copia_df[variable_x].min()
-                        
-                }
-                
-                copia_df[variable_x] = copia_df[variable_x].fillna(operaciones[metodo])
-                
-            lista = []
-
-            for i in range(len(categorias)):
-
-                categoria = copia_df[copia_df[variable_agrupar] == categorias[i]][variable_x]
-
-                lista.append(categoria)
+        def grafico_densidad(metodo, tipo, tema, titulo):
                 
             if tipo:
                 
@@ -2316,26 +5212,40 @@ class GenerarGraficos:
             else:
                 
                 curva = 'kde'
-
-            if nombres_leyendas:
                 
-                fig = ff.create_distplot(lista, nombres_leyendas[1:], show_hist = False, 
-                                         show_rug = False, curve_type = curva)
+            if (metodo, curva) not in curvas:
                 
-                fig.update_layout(legend_title = nombres_leyendas[0], template = tema, 
-                                  title = titulo if titulo else 'Gráfico de densidad')
+                valores = self.__imputar(df, [variable_x], metodo, [variable_x])[variable_x]
                 
-            else:
+                lista = []
+    
+                for i in range(len(categorias)):
+    
+                    categoria = valores.take(indice[categorias[i]])
+                    
+                    if not metodo:
+                        
+                        categoria = categoria.dropna()
+    
+                    lista.append(self.__curva_densidad(categoria.to_numpy(dtype = float), curva))
+                    
+                curvas[(metodo, curva)] = lista
                 
-                fig = ff.create_distplot(lista, categorias, show_hist = False, 
-                                         show_rug = False, curve_type = curva)
+            fig = go.Figure()
                 
-                fig.update_layout(title = titulo if titulo else 'Gráfico de densidad',
-                                  template = tema)
-            
-            for trace in fig['data']:
+            for i, (x, y) in enumerate(curvas[(metodo, curva)]):
+                
+                fig.add_trace(go.Scatter(x = x, y = y, mode = 'lines', fill = 'tozeroy',
+                                         name = nombres[i], legendgroup = nombres[i],
+                                         marker = dict(color = colores[i % len(colores)])))
+                
+            fig.update_layout(hovermode = 'closest', legend_traceorder = 'reversed',
+                              xaxis_zeroline = False, template = tema, 
+                              title = titulo if titulo else 'Gráfico de densidad')
+
+            if nombres_leyendas:
                 
-                trace['fill'] = 'tozeroy'
+                fig.update_layout(legend_title = nombres_leyendas[0])
             
             return fig
 
@@ -2376,9 +5286,38 @@ class GenerarGraficos:
             'YlGnBu', 'YlOrRd', 'Rainbow'
             
         ]
-
         
-        self.__app.layout.children.append(
+        escalas = {i: px.colors.get_colorscale(escala) for i, escala in enumerate(colores)}
+        
+        if not nombres_ejes:
+            
+            nombre_x = variable_x
+            nombre_y = variable_y
+            
+        else:
+            
+            nombre_x = nombres_ejes[0]
+            nombre_y = nombres_ejes[1]
+        
+        # Solo las filas con ambos valores entran en alguna celda
+        valores = df[[variable_x, variable_y]].dropna()
+        
+        # Los ejes categóricos tienen una celda por categoría
+        eje_x = self.__eje_conteos(valores[variable_x])
+        eje_y = self.__eje_conteos(valores[variable_y])
+        
+        # Número de bins de cada eje numérico según la regla 'auto' de numpy, 
+        # con el mismo límite que los controles del mapa de calor
+        bins_x, bins_y = [len(categorias) if categorias is not None else
+                          min(50, np.histogram_bin_edges(numeros, 'auto').size - 1)
+                          for numeros, _, categorias in (eje_x, eje_y)]
+        
+        # Cuadrícula de conteos, calculada la primera vez que se dibuja el gráfico
+        malla = {}
+        
+        grafico = self.__nuevo_grafico('contorno_densidad')
+        
+        self.__agregar(grafico, 
             html.Div([
                 html.Div([
                     
@@ -2395,6 +5334,7 @@ class GenerarGraficos:
                         html.Label('Título del gráfico:'),
                         dcc.Input(type = 'text', id = 'titulo_contorno_densidad', 
                                   placeholder = 'Ingrese el título del gráfico',
+                                  debounce = self.__modo_cliente,
                                   style = {'width': '100%'})], 
                      
                         style = {'display': 'inline-block', 'width': '30%', 'padding': '0 1%'}),
@@ -2425,50 +5365,42 @@ class GenerarGraficos:
             ])
         )
         
-        @self.__app.callback(
+        @self.__callback(
             
+            grafico,
             Output('contorno_densidad', 'figure'),
-            Input('tema_contorno_densidad', 'value'),
-            Input('titulo_contorno_densidad', 'value'),
-            Input('checklist_contorno_densidad', 'value'),
-            Input('colores_contorno_densidad', 'value')
+            cosmeticos = [Input('tema_contorno_densidad', 'value'), 
+                          Input('titulo_contorno_densidad', 'value'),
+                          Input('checklist_contorno_densidad', 'value'),
+                          Input('colores_contorno_densidad', 'value')],
+            titulo = 'Contorno de densidad',
+            propiedades = [(['data', 0, 'contours', 'showlabels'], None),
+                           (['data', 0, 'colorscale'], escalas)]
             
         )
         def grafico_contorno_densidad(tema, titulo, numeros, color):
-                
-            if numeros:
-                
-                text = True
-                
-            else:
-                
-                text = False
-
-            fig = px.density_contour(df, x = variable_x, y = variable_y, template = tema,
-                                     title = titulo if titulo else 'Contorno de densidad')
             
-            if not nombres_ejes:
-                
-                nombre_x = variable_x
-                nombre_y = variable_y
+            if not malla:
                 
-            else:
+                malla['conteos'] = self.__conteos_2d(eje_x, eje_y, bins_x, bins_y)
                 
-                nombre_x = nombres_ejes[0]
-                nombre_y = nombres_ejes[1]
+            celdas_x, celdas_y, z = malla['conteos']
+            
+            # Solo se envía la cuadrícula de conteos, sin importar el número de 
+            # filas
+            fig = go.Figure(go.Contour(x = celdas_x,
+                                       y = celdas_y,
+                                       z = z, colorscale = colores[color],
+                                       contours = dict(coloring = 'fill', 
+                                                       showlabels = bool(numeros)),
+                                       colorbar = dict(title = 'Conteo'),
+                                       hovertemplate = nombre_x + '=%{x}<br>' + 
+                                                       nombre_y + '=%{y}<br>' +
+                                                       'Conteo=%{z}<extra></extra>'))
 
             fig.update_layout(xaxis_title = nombre_x,
-                              yaxis_title = nombre_y)
-            
-            fig.update_traces(contours_coloring = "fill", contours_showlabels = text, 
-                              colorscale = colores[color])
+                              yaxis_title = nombre_y,
+                              template = tema,
+                              title = titulo if titulo else 'Contorno de densidad')
             
             return fig
-
-
-
-
-
-
-
-